@@ -0,0 +1,89 @@
+# Genetik algoritmanın en sıcak döngüleri için Numba çekirdekleri.
+# numba kurulu değilse NUMBA_AVAILABLE = False olur ve genetic_algorithm.py
+# saf Python yoluna (komşu listesi üzerinden yürüyüş) geri döner.
+# genetic_algorithm.py bu modülü paket içinden alır (from . import _ga_kernels);
+# cache=True derlemeleri __pycache__ altında modülün paket adıyla saklanır.
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
+
+def build_csr(adj, edge_index=None):
+    # adj[u] = (komşular...) listesini CSR dizilerine çevirir:
+    # u'nun komşuları -> indices[indptr[u]:indptr[u+1]]
+    # edge_index ({(u, v): edge id}) verilirse eids[i], indices[i] komşusuna giden edge'in id'sidir
+    # (yoksa -1); yürüyüş yolun edge id'lerini de ek maliyetsiz çıkarabilsin diye.
+    n = len(adj)
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    for u in range(n):
+        indptr[u + 1] = indptr[u] + len(adj[u])
+    indices = np.empty(indptr[n], dtype=np.int32)
+    eids = np.full(indptr[n], -1, dtype=np.int32)
+    for u in range(n):
+        indices[indptr[u]:indptr[u + 1]] = adj[u]
+        if edge_index is not None:
+            eids[indptr[u]:indptr[u + 1]] = [edge_index[(u, v)] for v in adj[u]]
+    return indptr, indices, eids
+
+
+@njit(cache=True, nogil=True)
+def seed(value):
+    # Numba'nın np.random durumu Python'un random modülünden ayrı; run başında tohumlanır.
+    np.random.seed(value)
+
+
+@njit(cache=True, nogil=True)
+def random_path(indptr, indices, eids, src, dst, visited, out, out_e):
+    # src -> dst rastgele yürüyüş. Yol out[:L] içine, edge id'leri out_e[:L-1] içine yazılır, L döner.
+    # Çıkmaza girilirse -1 döner. visited ve out çağrılar arasında tekrar kullanılır;
+    # visited girişte temiz kabul edilir, çıkışta sadece yoldaki düğümler sıfırlanır.
+    visited[src] = 1
+    out[0] = src
+    L = 1
+    cur = src
+    while cur != dst:
+        # ziyaret edilmemiş komşulardan birini tek geçişte seç (reservoir sampling)
+        k = 0
+        pick = -1
+        for i in range(indptr[cur], indptr[cur + 1]):
+            n = indices[i]
+            if not visited[n]:
+                k += 1
+                if np.random.randint(k) == 0:
+                    pick = i
+        if pick < 0:
+            break
+        cur = indices[pick]
+        visited[cur] = 1
+        out[L] = cur
+        out_e[L - 1] = eids[pick]
+        L += 1
+    for i in range(L):
+        visited[out[i]] = 0
+    if cur != dst:
+        return -1
+    return L
+
+
+def warmup():
+    # Çekirdekleri küçük sahte girdilerle 1 kez çağırır: derleme (veya cache=True ile diskten
+    # yükleme) ölçülen GA süresine girmesin. Tipler gerçek çağrılarla aynı olmalı (int32 CSR,
+    # uint8 visited), yoksa ilk gerçek çağrıda yeni bir imza için tekrar derlenir.
+    if not NUMBA_AVAILABLE:
+        return
+    indptr = np.array([0, 1, 1], dtype=np.int32)
+    indices = np.array([1], dtype=np.int32)
+    eids = np.array([0], dtype=np.int32)
+    seed(0)
+    random_path(indptr, indices, eids, 0, 1, np.zeros(2, dtype=np.uint8),
+                np.zeros(2, dtype=np.int32), np.zeros(1, dtype=np.int32))
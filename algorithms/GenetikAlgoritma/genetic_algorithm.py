@@ -7,28 +7,30 @@
 #    Metrikler bu algoritmanın pusulası olucak
 # En sonunda bulduğum en iyi yolun metriklerini tekrar hesaplattırıp arayüzde yazılacak
 
+# Paket olarak import edilir (adapter) veya proje kökünden modül olarak çalıştırılır:
+#   python -m algorithms.GenetikAlgoritma.genetic_algorithm
+# sys.path'e klasör eklenmez; böylece spawn ile açılan işçi süreçler de modülü adıyla import edebilir.
+
+import heapq
 import random
 import time
+from array import array
 import os  
 import sys
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx 
 
 # --- PATH AYARLAMALARI (Dinamik) ---
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(os.path.dirname(current_dir))
 
-data_folder_path = os.path.join(project_root, 'data')
-metrics_folder_path = os.path.join(project_root, 'metrics')
-
-if data_folder_path not in sys.path:
-    sys.path.append(data_folder_path)
-    
-if metrics_folder_path not in sys.path:
-    sys.path.append(metrics_folder_path)
+data_folder_path = os.path.join(project_root, 'data')  # CSV dosyaları (main bloğu)
 
 # --- IMPORTLAR ---
-import network_topology 
-from metric import MetricsEngine, Weights 
+import numpy as np
+from data import network_topology
+from metrics.metric import MetricsEngine, Weights
+from . import _ga_kernels
 
 # -------------------------------------------------------------------------------------------
 # (BURADAKİ FONKSİYONLARIN AYNI KALIYOR: generate_random_path, create_initial_population, 
@@ -38,45 +40,125 @@ from metric import MetricsEngine, Weights
 
 # ... (Algoritma fonksiyonların burada duruyor) ...
 
+# random.choice her çağrıda len() + _randbelow yapıyor; uzunluğu zaten bildiğimiz
+# listelerde randrange + index daha ucuz. (random.seed ile tekrar üretilebilirlik korunur)
+_randrange = random.randrange
+_random = random.random
+_INF = float('inf')
+
 
 # -------------------------------------------------------------------------------------------
 # Adım - 1
 
-# hedefe ulaşan random bir yol oluşturuyoruz
-def generate_random_path(graph, src, dst):
-    path = [src]       # 1. Yola başlangıç düğümüyle başla
+# NetworkX AtlasView yerine düz komşu listesi: adj[u] = (u'nun komşuları)
+# Düğüm id'leri 0..N-1 arası tam sayı olduğu için liste indexi = düğüm id.
+# numba varsa aynı komşuluk CSR dizileri olarak da tutulur (indptr/indices) ve
+# rastgele yürüyüş _ga_kernels.random_path ile derlenmiş kodda yapılır.
+# visited / out / out_e: run boyunca tekrar kullanılan yürüyüş tamponları (her yolda yeniden ayrılmaz).
+# edge_index: MetricsEngine'in {(u, v): edge id} sözlüğü; yürüyüş yolun edge id'lerini de çıkarır.
+class Adjacency(list):
+    __slots__ = ('indptr', 'indices', 'eids', 'edge_index', 'visited', 'out', 'out_e')
+
+
+# Bir birey: düğüm listesi + doğduğu anda bilinen edge id'leri (edge tablosu satırları).
+# Çaprazlama/mutasyon çocukların edge'lerini ebeveynlerinkini keserek kurar; böylece
+# puanlarken yol tekrar (u, v) -> edge id sözlük aramasından geçmez. edges None ise bilinmiyor.
+class Individual(list):
+    __slots__ = ('edges',)
+
+
+def _individual(nodes, edges):
+    ind = Individual(nodes)
+    ind.edges = edges
+    return ind
+
+
+def build_adjacency(graph, edge_index=None):
+    n = max(graph.nodes()) + 1 if graph.number_of_nodes() > 0 else 0
+    adj = Adjacency([()] * n)
+    for u, neighbors in graph.adjacency():
+        adj[u] = tuple(neighbors)
+
+    adj.indptr = None
+    adj.edge_index = edge_index
+    if _ga_kernels.NUMBA_AVAILABLE:
+        adj.indptr, adj.indices, adj.eids = _ga_kernels.build_csr(adj, edge_index)
+        adj.visited = np.zeros(n, dtype=np.uint8)
+        adj.out = np.empty(n, dtype=np.int32)
+        adj.out_e = np.empty(max(n - 1, 1), dtype=np.int32)
+    else:
+        adj.visited = bytearray(n)
+        adj.out = array('i', bytes(4 * n))
+    return adj
+
+
+def _walk(adj, src, dst):
+    # src -> dst rastgele yürüyüşü adj.out tamponuna yazar, yol uzunluğunu döndürür (çıkmaz -> -1).
+    # adj.visited çağrı başında temiz kabul edilir ve çıkarken sadece ziyaret edilen
+    # düğümler sıfırlanır (her yolda N boyutlu dizi ayırmak / temizlemek yok).
+    if adj.indptr is not None:
+        return _ga_kernels.random_path(adj.indptr, adj.indices, adj.eids, src, dst,
+                                       adj.visited, adj.out, adj.out_e)
+
+    visited = adj.visited # "n not in path" taraması yerine O(1) ziyaret kontrolü
+    out = adj.out
+    out[0] = src       # 1. Yola başlangıç düğümüyle başla
+    L = 1
     current_node = src # Şu an buradayız
+    visited[src] = 1
 
     while current_node != dst:
-        if current_node not in graph:
-            return None 
-            
-        neighbors = graph[current_node] 
-        possible_next_nodes = [] 
-        
-        for n in neighbors:      
-            if n not in path:    
-                possible_next_nodes.append(n) 
-        if not possible_next_nodes:
-            return None 
+        # Aday listesi kurmadan tek geçişte seçim (reservoir sampling):
+        # k. uygun komşu 1/k olasılıkla seçileni değiştirir -> hepsi eşit olasılıklı.
+        # (randrange burada her aday için çağrılacağından C tarafındaki random() kullanılıyor)
+        k = 0
+        next_node = -1
+        for n in adj[current_node]:
+            if not visited[n]:
+                k += 1
+                if _random() * k < 1.0:
+                    next_node = n
+        if next_node < 0:
+            break
         
-        next_node = random.choice(possible_next_nodes)
-        path.append(next_node)
+        visited[next_node] = 1
+        out[L] = next_node
+        L += 1
         current_node = next_node
-    
-    return path
+
+    for i in range(L):
+        visited[out[i]] = 0
+    return L if current_node == dst else -1
+
+
+# hedefe ulaşan random bir yol oluşturuyoruz
+def generate_random_path(adj, src, dst):
+    if not 0 <= src < len(adj):
+        return None
+    L = _walk(adj, src, dst)
+    if L < 0:
+        return None 
+    nodes = adj.out[:L].tolist()  # liste sadece dışarı verilirken oluşturulur
+    if adj.edge_index is None:
+        edges = None
+    elif adj.indptr is not None:
+        edges = adj.out_e[:L - 1].tolist()  # derlenmiş yürüyüş edge id'lerini de yazdı
+    else:
+        edge_index = adj.edge_index
+        edges = [edge_index[(u, v)] for u, v in zip(nodes, nodes[1:])]
+    return _individual(nodes, edges)
 
 
 # ---------------------------------------------------------------------------------------------
 # --- ADIM 2: İLK POPÜLASYONU (NESLİ) OLUŞTURMA ---
 
-def create_initial_population(graph, src, dst, pop_size):
+def create_initial_population(adj, src, dst, pop_size):
     population = [] 
     attempts = 0    
     max_attempts = pop_size * 10 
     
     while len(population) < pop_size:
-        path = generate_random_path(graph, src, dst)
+        path = generate_random_path(adj, src, dst)
         if path is not None:
             population.append(path)
         attempts = attempts + 1
@@ -89,32 +171,123 @@ def create_initial_population(graph, src, dst, pop_size):
 # -------------------------------------------------------------------------------------------------
 # --- ADIM 3: SEÇİM (SELECTION) ---
 
-def selection(population, engine, num_parents, weights_obj):
+def path_cost(engine, weights_obj, path):
+    # Tek bir yolun fitness değeri (maliyet). Geçersiz yol -> sonsuz maliyet.
+    # Geçerlilik önceden kontrol edilir; ValueError fırlatıp yakalamak normal akış olmasın.
+    if engine.path_edge_ids(path) is None:
+        return float('inf')
+    stats = engine.compute(path)
+    return engine.weighted_sum(stats, weights_obj)
+
+
+# --- PARALEL FITNESS (master/slave GA) ---
+# Her işçi süreç kendi MetricsEngine'ini 1 kez kurar (prepare_graph ile aynı float32 tablolar),
+# sonra yol parçalarını seri yoldaki gibi tek weighted_sum_many çağrısıyla puanlar.
+# Segment toplamları yol başına bağımsız: parçalara bölmek maliyetleri değiştirmez,
+# önbellek / seçim sırası / best_cost işçi sayısından bağımsızdır.
+_worker_engine = None
+_worker_weights = None
+
+def _init_worker(graph, w_tuple):
+    global _worker_engine, _worker_weights
+    _worker_engine = MetricsEngine(graph, table_dtype=np.float32)
+    _worker_weights = Weights(w_delay=w_tuple[0], w_reliability=w_tuple[1], w_resource=w_tuple[2])
+
+def _score_chunk(args):
+    paths, path_edges, cutoff = args
+    return _worker_engine.weighted_sum_many(paths, _worker_weights, cutoff=cutoff, path_edges=path_edges).tolist()
+
+
+def selection(population, engine, num_parents, weights_obj, cost_cache, pool=None, tournament_k=0, workers=1):
+    # cost_cache: { tuple(path): maliyet } -> aynı yol bir run boyunca sadece 1 kez hesaplanır.
+    # Elitizm ve düşük mutasyon yüzünden aynı yollar nesiller boyunca tekrar tekrar geliyor.
+    # pool verilirse önbellekte olmayan yollar işçi (workers adet) süreçlere parça parça dağıtılır.
+    keys = [tuple(path) for path in population]
+    missing = {}
+    for key, path in zip(keys, population):
+        if key not in cost_cache and key not in missing:
+            missing[key] = path
+
+    if missing:
+        # Dal-sınır (sadece en iyi yarı seçiminde): popülasyonda maliyeti bilinen en az
+        # num_parents birey varsa, bunların num_parents. en iyisinden kötü olan yeni yol
+        # zaten seçilemez. Gecikme terimi bu eşiği aşanlar tam hesaplanmaz (inf döner).
+        cutoff = None
+        if tournament_k <= 0:
+            known = [cost_cache[key] for key in keys if key in cost_cache]
+            if len(known) >= num_parents > 0:
+                cutoff = heapq.nsmallest(num_parents, known)[-1]
+        paths = list(missing.values())
+        path_edges = [getattr(path, 'edges', None) for path in paths]
+        if pool is not None:
+            # İşçi başına bir parça: her parça işçide tek weighted_sum_many çağrısı (yol başına IPC yok)
+            size = -(-len(paths) // max(1, workers))
+            chunks = [([list(path) for path in paths[i:i + size]], path_edges[i:i + size], cutoff)
+                      for i in range(0, len(paths), size)]
+            costs = [cost for part in pool.map(_score_chunk, chunks) for cost in part]
+        else:
+            # Tüm yeni yollar tek NumPy çağrısında puanlanır (yol başına Python döngüsü yok)
+            costs = engine.weighted_sum_many(paths, weights_obj, cutoff=cutoff, path_edges=path_edges).tolist()
+        if cutoff is not None:
+            # Budanan yollar önbelleğe yazılmaz: inf gerçek maliyetleri değil, sadece bu nesilde elendiler
+            missing = {key: cost for key, cost in zip(missing, costs) if cost != _INF}
+            costs = missing.values()
+        for key, cost in zip(missing, costs):
+            cost_cache[key] = cost
+
+    if tournament_k > 0:
+        return _tournament(population, num_parents, cost_cache, tournament_k)
+
     scored_paths = []
-    for path in population:
-        try:
-            stats = engine.compute(path)
-            cost = engine.weighted_sum(stats, weights_obj)
-            scored_paths.append((path, cost))
-        except ValueError:
-            scored_paths.append((path, float('inf')))
+    for key, path in zip(keys, population):
+        scored_paths.append((path, cost_cache.get(key, _INF)))
     
     scored_paths.sort(key=lambda x: x[1]) 
     selected_parents = []
-    for i in range(num_parents):
+    for i in range(min(num_parents, len(scored_paths))):
         path = scored_paths[i][0]
         selected_parents.append(path)
     return selected_parents
 
 
+def _tournament(population, num_parents, cost_cache, k):
+    # k'lı turnuva seçimi: rastgele k birey çekilir, en düşük maliyetli olan ebeveyn olur.
+    # Sıralama yok; zayıf bireyler de arada seçilebilir. Maliyetler zaten cost_cache'te.
+    # Not: Bu topolojide (pop 50, 50 nesil) en iyi yarıyı almaktan daha kötü sonuç verdi,
+    # o yüzden varsayılan kapalı (config['tournament_k'] = 0).
+    pop_size = len(population)
+    if pop_size == 0:
+        return []
+    costs = [cost_cache[tuple(path)] for path in population]
+    k = min(k, pop_size)
+    selected_parents = []
+    for _ in range(num_parents):
+        best_i = _randrange(pop_size)
+        for _ in range(k - 1):
+            i = _randrange(pop_size)
+            if costs[i] < costs[best_i]:
+                best_i = i
+        selected_parents.append(population[best_i])
+    return selected_parents
+
+
 # -------------------------------------------------------------------------------------------------
 # --- ADIM 4: ÇAPRAZLAMA (CROSSOVER) ---
 
 def crossover(parent1, parent2):
-    common_nodes = [] 
-    for node in parent1:      
-        if node in parent2:   
-            common_nodes.append(node) 
+    # Düğüm -> index haritaları tek geçişte kurulur; "node in parent2" ve .index()
+    # liste taramaları (O(L1*L2)) yerine sözlük aramaları (O(L1+L2)).
+    # Çaprazlama sonrası yolda tekrar eden düğüm olabilir; .index() gibi ilk geçiş tutulur.
+    pos1 = {}
+    for i, node in enumerate(parent1):
+        if node not in pos1:
+            pos1[node] = i
+    pos2 = {}
+    for i, node in enumerate(parent2):
+        if node not in pos2:
+            pos2[node] = i
+
+    common_nodes = [node for node in parent1 if node in pos2]
 
     if len(common_nodes) > 2:
         candidates = common_nodes[1:-1]
@@ -124,20 +297,29 @@ def crossover(parent1, parent2):
     if not candidates:
         return parent1, parent2
         
-    cut_node = random.choice(candidates)
-    idx1 = parent1.index(cut_node)
-    idx2 = parent2.index(cut_node)
+    cut_node = candidates[_randrange(len(candidates))]
+    idx1 = pos1[cut_node]
+    idx2 = pos2[cut_node]
     
     child1 = parent1[:idx1+1] + parent2[idx2+1:]
     child2 = parent2[:idx2+1] + parent1[idx1+1:]
-    
-    return child1, child2
+
+    # Kesim düğümü iki ebeveynde de var -> çocukların edge'leri ebeveyn edge'lerinin parçaları
+    e1 = getattr(parent1, 'edges', None)
+    e2 = getattr(parent2, 'edges', None)
+    if e1 is not None and e2 is not None:
+        return _individual(child1, e1[:idx1] + e2[idx2:]), _individual(child2, e2[:idx2] + e1[idx1:])
+    return _individual(child1, None), _individual(child2, None)
 
 
 # -------------------------------------------------------------------------------------------------
 # --- ADIM 5: MUTASYON (MUTATION) ---
 
-def mutation(path, graph, src, dst, mutation_rate):
+# Aynı (kesim düğümü -> dst) kuyrukları nesiller boyunca tekrar tekrar isteniyor.
+# suffix_cache verilirse her kesim düğümü için en fazla cache_size başarılı kuyruk saklanır;
+# dolunca yeni yürüyüş yapmak yerine aralarından rastgele biri kullanılır.
+# Çeşitliliği azalttığı için varsayılan kapalı (config['suffix_cache'] = 0).
+def mutation(path, adj, src, dst, mutation_rate, suffix_cache=None, cache_size=0):
     if random.random() > mutation_rate:
         return path 
     if len(path) < 3:
@@ -145,86 +327,160 @@ def mutation(path, graph, src, dst, mutation_rate):
     cut_index = random.randint(1, len(path) - 2) # yolun kesilme indexi
     cut_node = path[cut_index]
     partial_path = path[:cut_index + 1] # yolun kesiminden geri kalan
-    new_tail = generate_random_path(graph, cut_node, dst) # generate_random_path ile kesilen noktadan başlıyan yeni bir yol oluşturuz.
-    if new_tail is None:
-        return path
+
+    tails = suffix_cache.get(cut_node) if suffix_cache is not None else None
+    if tails is not None and len(tails) >= cache_size:
+        new_tail = tails[_randrange(len(tails))]
+    else:
+        new_tail = generate_random_path(adj, cut_node, dst) # generate_random_path ile kesilen noktadan başlıyan yeni bir yol oluşturuz.
+        if new_tail is None:
+            return path
+        if suffix_cache is not None:
+            suffix_cache.setdefault(cut_node, []).append(new_tail)
     final_path = partial_path[:-1] + new_tail
-    return final_path
+    edges = getattr(path, 'edges', None)
+    if edges is not None and new_tail.edges is not None:
+        return _individual(final_path, edges[:cut_index] + new_tail.edges)
+    return _individual(final_path, None)
 
 
 # -------------------------------------------------------------------------------------------------
 # --- ADIM 6: ANA GENETİK ALGORİTMA FONKSİYONU ---
 
-def run_genetic_algorithm(graph, src, dst, config):
-
-    # ---------------------------------------------
-
+def _map_attrs_inplace(graph):
     # Konfigrasyon uyumluluğu için gerekli olan kısım
 
     # --- GÜVENLİK YAMASI: İsim uyuşmazlığını otomatik düzelt ---
     # Arayüzden gelen ham veriyi (s_ms, delay_ms vb.) bizim anlayacağımız dile çevirir.
+    changed = False
     for n, data in graph.nodes(data=True):
         if 's_ms' in data and 'processing_delay_ms' not in data: 
             data['processing_delay_ms'] = data['s_ms']
+            changed = True
         if 'r_node' in data and 'node_reliability' not in data: 
             data['node_reliability'] = data['r_node']
+            changed = True
 
     for u, v, data in graph.edges(data=True):
         if 'delay_ms' in data and 'link_delay_ms' not in data: 
             data['link_delay_ms'] = data['delay_ms']
+            changed = True
         if 'r_link' in data and 'link_reliability' not in data: 
             data['link_reliability'] = data['r_link']
-        if 'capacity_mbps' in data and 'capacity_mbps' not in data: # Zaten aynı ama garanti olsun
-             data['capacity_mbps'] = data['capacity_mbps']
+            changed = True
+
+    # Metrik attribute'ları yerinde değişti: graph'a bağlı önbellekler (adapter._get_engine vb.)
+    # G.graph['version'] değişince yeniden kurulur
+    if changed:
+        graph.graph['version'] = graph.graph.get('version', 0) + 1
+
+
+def prepare_graph(graph):
+    # İsim eşleştirmesini 1 kez yapar ve graph için MetricsEngine döndürür.
+    # Aynı graph üzerinde birden çok run yapılacaksa (arayüz, deney taramaları)
+    # bu engine run_genetic_algorithm'e verilir; eşleştirme ve engine kurulumu her run'da tekrarlanmaz.
+    # Fitness tabloları float32: sıralama için yeterli hassasiyet, yarı bellek trafiği.
+    # Numba çekirdekleri de burada ısıtılır; JIT derlemesi run süresine yazılmaz.
+    _map_attrs_inplace(graph)
+    _ga_kernels.warmup()
+    return MetricsEngine(graph, table_dtype=np.float32)
 
-    # --------------------------------------
 
+def run_genetic_algorithm(graph, src, dst, config, engine=None):
+    # engine: prepare_graph(graph) sonucu. Verilmezse burada hazırlanır (eski kullanım).
+    if engine is None:
+        engine = prepare_graph(graph)
 
     pop_size = config['pop_size']
     generations = config['generations']
     mutation_rate = config['mutation_rate']
+    suffix_cache_size = int(config.get('suffix_cache', 0))  # 0 -> mutasyon kuyruk önbelleği kapalı
+    tournament_k = int(config.get('tournament_k', 0))  # >0 -> k'lı turnuva seçimi, 0 -> en iyi yarı
+    # patience > 0 -> en iyi maliyet art arda patience nesil boyunca tol'dan fazla iyileşmezse erken durulur
+    patience = int(config.get('patience', 0) or 0)
+    tol = float(config.get('tol', 0.0))
     
     w_tuple = config['weights']
     weights_obj = Weights(w_delay=w_tuple[0], w_reliability=w_tuple[1], w_resource=w_tuple[2])
     
-    engine = MetricsEngine(graph)
+    cost_cache = {}  # Bu run'a özel fitness önbelleği (tuple(path) -> maliyet)
 
-    population = create_initial_population(graph, src, dst, pop_size)
+    # workers > 1 ise fitness hesapları süreç havuzunda yapılır (varsayılan: seri).
+    # workers <= 0 -> tüm çekirdekler. Havuz run boyunca açık kalır, her nesilde fork maliyeti yok.
+    workers = int(config.get('workers', 1))
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph, tuple(w_tuple)))
+
+    adj = build_adjacency(graph, engine.edge_index())  # komşuluklar run başında 1 kez çıkarılır
+    if _ga_kernels.NUMBA_AVAILABLE:
+        _ga_kernels.seed(random.randrange(2**31))  # random.seed ile tekrar üretilebilirlik
+
+    try:
+        return _evolve(adj, src, dst, pop_size, generations, mutation_rate, engine, weights_obj, cost_cache, pool,
+                       suffix_cache_size, tournament_k, patience, tol, workers)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _evolve(adj, src, dst, pop_size, generations, mutation_rate, engine, weights_obj, cost_cache, pool,
+            suffix_cache_size=0, tournament_k=0, patience=0, tol=0.0, workers=1):
+    population = create_initial_population(adj, src, dst, pop_size)
     best_path = None
     best_cost = float('inf') 
+    stale = 0  # en iyi maliyetin tol'dan fazla iyileşmediği art arda nesil sayısı
+    # kesim düğümü -> dst'ye giden önceki rastgele kuyruklar (bu run'a özel)
+    suffix_cache = {} if suffix_cache_size > 0 else None
 
     for gen in range(generations):
         num_parents = pop_size // 2 
-        parents = selection(population, engine, num_parents, weights_obj)
+        parents = selection(population, engine, num_parents, weights_obj, cost_cache, pool, tournament_k, workers)
         
         if not parents:
             print("Uyarı: Geçerli yol bulunamadı!")
             break
             
-        current_best_path = parents[0] 
+        # Turnuvada parents[0] en iyi olmak zorunda değil; en iyi birey popülasyondan bulunur.
+        # selection tüm yolları zaten puanladı, tekrar hesaplamaya gerek yok. Geçersiz ya da
+        # budanmış yollar önbellekte inf / yok -> try/except yerine .get ile inf sayılır.
+        current_best_path = None
+        current_best_cost = _INF
+        for path in population:
+            cost = cost_cache.get(tuple(path), _INF)
+            if cost < current_best_cost:
+                current_best_cost = cost
+                current_best_path = path
         
-        try:
-            stats = engine.compute(current_best_path)
-            current_best_cost = engine.weighted_sum(stats, weights_obj)
-            
-            if current_best_cost < best_cost:   # Maliyet ne kadar düşük olursa o kadar iyi o yüzden : current_best_cost < best_cost olarak yazdık
-                best_cost = current_best_cost
-                best_path = current_best_path
-        except:
-            continue
-
-        new_population = []
-        while len(new_population) < pop_size:
-            p1 = random.choice(parents)
-            p2 = random.choice(parents)
+        if current_best_cost < best_cost - tol:
+            stale = 0
+        else:
+            stale += 1
+        if current_best_cost < best_cost:   # Maliyet ne kadar düşük olursa o kadar iyi o yüzden : current_best_cost < best_cost olarak yazdık
+            best_cost = current_best_cost
+            best_path = current_best_path
+        if patience > 0 and stale >= patience:
+            break  # Yakınsama platosu: kalan nesiller sonucu değiştirmiyor
+
+        # Yeni nesil boyutu belli: liste baştan ayrılır, index ile doldurulur (append/len yok)
+        num_parents = len(parents)
+        new_population = [None] * pop_size
+        i = 0
+        while i < pop_size:
+            p1 = parents[_randrange(num_parents)]
+            p2 = parents[_randrange(num_parents)]
             c1, c2 = crossover(p1, p2)
-            c1 = mutation(c1, graph, src, dst, mutation_rate)
-            c2 = mutation(c2, graph, src, dst, mutation_rate)
-            new_population.append(c1)
-            if len(new_population) < pop_size:
-                new_population.append(c2)
+            new_population[i] = mutation(c1, adj, src, dst, mutation_rate, suffix_cache, suffix_cache_size)
+            i += 1
+            if i < pop_size:
+                new_population[i] = mutation(c2, adj, src, dst, mutation_rate, suffix_cache, suffix_cache_size)
+                i += 1
         population = new_population
 
+    if best_path is not None:
+        best_path = list(best_path)  # dışarıya düz liste verilir
     return best_path, best_cost
 
 
@@ -253,26 +509,14 @@ if __name__ == "__main__":
 
 
 
-    # -----------------------------------------------------
-    # Konfigrasyon uyumluluğu için gerekli olan kısım
-
     # --- KRİTİK ADIM: İSİM EŞLEŞTİRME (MAPPING) ---
     # Arkadaşının CSV'den okuduğu isimler -> Melek'in Motorunun beklediği isimler
     # Node: s_ms -> processing_delay_ms, r_node -> node_reliability
     # Edge: delay_ms -> link_delay_ms, r_link -> link_reliability, capacity_mbps -> capacity_mbps
-    
-    for n, data in G.nodes(data=True):
-        if 's_ms' in data: data['processing_delay_ms'] = data['s_ms']
-        if 'r_node' in data: data['node_reliability'] = data['r_node']
-
-    for u, v, data in G.edges(data=True):
-        if 'delay_ms' in data: data['link_delay_ms'] = data['delay_ms']
-        if 'r_link' in data: data['link_reliability'] = data['r_link']
-        # capacity_mbps zaten aynı isimde, kopyalamaya gerek yok ama garanti olsun:
-        if 'capacity_mbps' in data: data['capacity_mbps'] = data['capacity_mbps']
+    # Eşleştirme + MetricsEngine 1 kez kurulur; hem algoritma hem sonuç raporu bunu kullanır.
+    engine = prepare_graph(G)
         
     print("--- Veri Eşleştirmesi Tamamlandı ---")
-    # -----------------------------------------------------
 
 
     
@@ -305,15 +549,14 @@ if __name__ == "__main__":
     # Algoritmayı Çalıştır
     baslangic_zamani = time.time()
     
-    en_iyi_yol, en_iyi_maliyet = run_genetic_algorithm(G, src_node, dst_node, config)
+    en_iyi_yol, en_iyi_maliyet = run_genetic_algorithm(G, src_node, dst_node, config, engine)
     
     bitis_zamani = time.time()
     gecen_sure = bitis_zamani - baslangic_zamani
     
     # Sonuç Raporu
     if en_iyi_yol:
-        # Sonuçları detaylandırmak için arkadaşının motorunu burada da kullanıyoruz
-        engine = MetricsEngine(G)
+        # Sonuçları detaylandırmak için aynı motoru burada da kullanıyoruz
         detaylar = engine.compute(en_iyi_yol)
         
         print("\n" + "="*50)
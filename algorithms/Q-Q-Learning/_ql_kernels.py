@@ -0,0 +1,138 @@
+# Q-Learning eğitim döngüsü için Numba çekirdekleri.
+# numba kurulu değilse NUMBA_AVAILABLE = False olur ve q_learning.py
+# saf Python/NumPy döngüsüne geri döner.
+# Komşular CSR dizileri olarak verilir (graph_loader.to_csr + bant genişliği filtresi):
+# u'nun geçerli komşuları -> indices[indptr[u]:indptr[u+1]]
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
+
+# run_episode dönüş durumları
+DEAD_END, LOOP, REACHED, TOO_LONG = 0, 1, 2, 3
+
+
+@njit(cache=True, nogil=True)
+def seed(value):
+    # Numba'nın np.random durumu Python'un random modülünden ayrı; eğitim başında tohumlanır.
+    np.random.seed(value)
+
+
+@njit(cache=True, nogil=True)
+def _max_q(Q, indptr, indices, s):
+    # s'nin geçerli komşuları üzerinden max Q (komşu yoksa 0)
+    lo = indptr[s]
+    hi = indptr[s + 1]
+    if lo == hi:
+        return 0.0
+    best = Q[s, indices[lo]]
+    for i in range(lo + 1, hi):
+        q = Q[s, indices[i]]
+        if q > best:
+            best = q
+    return best
+
+
+@njit(cache=True, nogil=True)
+def run_episode(Q, indptr, indices, src, dst, epsilon, alpha, gamma, max_len, path, visited):
+    # Tek episod: epsilon-greedy yürüyüş + adım adım Q güncellemesi.
+    # Yol path[:L] içine yazılır. Hedefe varılırsa son (ödüllü) güncelleme YAPILMAZ:
+    # ödül yolun metric maliyetine bağlı, çağıran hesaplayıp uygular (episodun son güncellemesi).
+    # visited girişte temiz kabul edilir, çıkışta sadece yoldaki düğümler sıfırlanır.
+    # Dönüş: (durum, L, adım ödüllerinin toplamı, döngüye giren aksiyon; LOOP değilse -1)
+    path[0] = src
+    visited[src] = True
+    L = 1
+    total = 0.0
+    status = DEAD_END
+    loop_action = -1
+    state = src
+    while state != dst:
+        lo = indptr[state]
+        hi = indptr[state + 1]
+        if lo == hi:
+            status = DEAD_END  # Gidecek yol yok (Tıkandı)
+            break
+
+        # Epsilon-Greedy (eşitlikte ilk komşu; komşu sırası çağıran tarafta karıştırılmış)
+        if np.random.random() < epsilon:
+            action = indices[lo + np.random.randint(hi - lo)]
+        else:
+            action = indices[lo]
+            best = Q[state, action]
+            for i in range(lo + 1, hi):
+                q = Q[state, indices[i]]
+                if q > best:
+                    best = q
+                    action = indices[i]
+
+        # Döngü Engelleme: O(1) visited kontrolü
+        if visited[action]:
+            reward = -1000.0
+            Q[state, action] += alpha * (reward + gamma * _max_q(Q, indptr, indices, action) - Q[state, action])
+            total += reward
+            status = LOOP
+            loop_action = action
+            break
+
+        path[L] = action
+        L += 1
+        visited[action] = True
+
+        if action == dst:
+            status = REACHED
+            break
+
+        # Hedefe daha varmadıysa küçük bir adım cezası
+        reward = -1.0
+        Q[state, action] += alpha * (reward + gamma * _max_q(Q, indptr, indices, action) - Q[state, action])
+        total += reward
+        state = action
+
+        if L > max_len:
+            status = TOO_LONG  # Sonsuz döngü koruması
+            break
+
+    for i in range(L):
+        visited[path[i]] = False
+    return status, L, total, loop_action
+
+
+@njit(cache=True, nogil=True)
+def replay(Q, indptr, indices, S, A, R, NS, batch, weights, alpha, gamma, prio, prio_eps, prio_pow):
+    # Öncelikli tekrar (prioritized replay): seçilen geçişlere ağırlıklı (IS) ek Q güncellemesi.
+    # Her güncellemeden sonra geçişin önceliği (|TD hatası| + prio_eps) ^ prio_pow olur
+    # (üs burada alınır; örneklemede tüm tampon için tekrar alınmaz).
+    for j in range(len(batch)):
+        i = batch[j]
+        s = S[i]
+        a = A[i]
+        td = R[i] + gamma * _max_q(Q, indptr, indices, NS[i]) - Q[s, a]
+        Q[s, a] += alpha * weights[j] * td
+        prio[i] = (abs(td) + prio_eps) ** prio_pow
+
+
+def warmup():
+    # Çekirdekleri küçük bir graph üzerinde 1 kez çağırarak derler (cache=True ise diskten yüklenir)
+    if not NUMBA_AVAILABLE:
+        return
+    indptr = np.array([0, 1, 3, 4], dtype=np.int64)
+    indices = np.array([1, 0, 2, 1], dtype=np.int32)
+    Q = np.zeros((3, 3), dtype=np.float32)  # q_learning.py ile aynı dtype (aynı imza derlenir)
+    path = np.empty(4, dtype=np.int32)
+    visited = np.zeros(3, dtype=np.bool_)
+    run_episode(Q, indptr, indices, 0, 2, 0.5, 0.1, 0.9, 3, path, visited)
+    S = np.array([0], dtype=np.int32)
+    R = np.array([-1.0])
+    replay(Q, indptr, indices, S, S + 1, R, S + 1, np.array([0], dtype=np.int64), R * 0 + 1,
+           0.1, 0.9, R * 0, 1e-6, 0.6)
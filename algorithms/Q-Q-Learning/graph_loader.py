@@ -1,6 +1,11 @@
-import pandas as pd
+import math
+import weakref
+import numpy as np
 import networkx as nx
 
+# pandas sadece CSV okurken gerekir: q_learning bu modülden yalnızca node_index / to_csr alır,
+# pandas'ı (~250 ms) yüklemesin diye CSV okuyan fonksiyonların içinde import edilir.
+
 def safe_float(value):
     """
     Gelen veriyi güvenli bir şekilde float'a çevirir.
@@ -12,7 +17,120 @@ def safe_float(value):
     except (ValueError, TypeError):
         return 0.0
 
+def safe_float_column(col):
+    """
+    safe_float'ın sütun (Series) üzerinde toplu çalışan hali.
+    Satır satır dönmek yerine tüm sütunu tek seferde float'a çevirir;
+    çevrilemeyen değerler 0.0 olur (boş hücreler safe_float'taki gibi NaN kalır).
+    """
+    import pandas as pd
+    vals = pd.to_numeric(col.astype(str).str.replace(',', '.', regex=False), errors='coerce')
+    vals[vals.isna() & col.notna()] = 0.0
+    return vals.to_numpy(dtype=float)
+
+def _id_column(col, kind):
+    """
+    ID sütununu sayıya çevirir ve (değerler, geçerli satır maskesi) döndürür.
+    Sayıya çevrilemeyen satırlar için eski satır satır okumadaki gibi hata mesajı basılır.
+    """
+    import pandas as pd
+    vals = pd.to_numeric(col, errors='coerce')
+    ok = vals.notna().to_numpy()
+    for i in (~ok).nonzero()[0]:
+        print(f"Satır {i} okunurken hata ({kind}): geçersiz ID {col.iloc[i]!r}")
+    return vals.to_numpy(), ok
+
+def _bw(edge_data):
+    """Kenarın bant genişliği (veri setinde isim farklılıkları olabilir, hepsini kontrol et)"""
+    return edge_data.get('bandwidth', edge_data.get('capacity_mbps', edge_data.get('bant_genisligi', 0)))
+
+def neg_log(rel):
+    """
+    -log(güvenilirlik) dizisi; güvenilirlik <= 0 (veya boş) olanlar maliyete katılmaz (0).
+    Yükleme sırasında 1 kez alınır ve 'neg_log_rel' attribute'u olarak saklanır.
+    """
+    rel = np.asarray(rel, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(rel > 0, -np.log(rel), 0.0)
+
+def _neg_log_rel(data, key):
+    """Önceden hesaplanmış 'neg_log_rel' varsa onu, yoksa -log(data[key]) (varsayılan 0.99)."""
+    value = data.get('neg_log_rel')
+    if value is None:
+        rel = data.get(key, 0.99)
+        value = -math.log(rel) if rel > 0 else 0.0
+    return value
+
+# to_csr / node_index sonuçları graph başına 1 kez kurulur (graph silinince önbellekten de düşer)
+_CSR_CACHE = weakref.WeakKeyDictionary()
+_NODE_CACHE = weakref.WeakKeyDictionary()
+
+def node_index(G):
+    """
+    (düğümler, düğüm -> index) çiftini döndürür: düğümler G.nodes() sırasında bir tuple.
+    Graph başına önbelleğe alınır; her çağrıda list(G.nodes()) kurulmaz.
+    """
+    cached = _NODE_CACHE.get(G)
+    if cached is None:
+        nodes = tuple(G.nodes())
+        cached = (nodes, {n: i for i, n in enumerate(nodes)})
+        _NODE_CACHE[G] = cached
+    return cached
+
+def to_csr(G):
+    """
+    Graph'ı 1 kez CSR komşuluk dizilerine ve paralel attribute dizilerine çevirir;
+    sıcak döngüler NetworkX sözlüklerine dokunmadan bu dizilerle çalışır.
+    Düğüm i = node_index(G)[0][i]; i'nin komşuları indices[indptr[i]:indptr[i+1]]
+    (G[n] sırasıyla). Kenar dizileri her komşuluk girdisi (slot) için bir eleman içerir:
+      bw: bant genişliği (_bw), delay: link_delay, log_rel: neg_log_rel / -log(link_reliability),
+      res: 1000 / bw (bw <= 0 ise 0)
+    Düğüm dizileri: node_proc: processing_delay, node_log_rel: neg_log_rel / -log(reliability).
+    Varsayılanlar metrics.py ile aynı (gecikme 0, güvenilirlik 0.99).
+    Dönüş: (indptr, indices, bw, delay, log_rel, res, node_proc, node_log_rel)
+    Sonuç graph başına önbelleğe alınır (attribute'lar sonradan değişirse yansımaz);
+    diziler paylaşıldığı için çağıranlar yerinde değiştirmemelidir.
+    """
+    cached = _CSR_CACHE.get(G)
+    if cached is not None:
+        return cached
+
+    node2idx = node_index(G)[1]
+    n_nodes = len(node2idx)
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    indices, bw, delay, log_rel = [], [], [], []
+    node_proc, node_log_rel = [], []
+    for i, (n, nbrs) in enumerate(G.adjacency()):
+        indptr[i + 1] = indptr[i] + len(nbrs)
+        # Düğüm başına toplu ekleme (kenar başına 4 ayrı append yerine)
+        edges = nbrs.values()
+        indices.extend(map(node2idx.__getitem__, nbrs))
+        bw.extend(map(_bw, edges))
+        delay.extend([d.get('link_delay', 0) for d in edges])
+        # load_graph'ta hesaplanan -log(güvenilirlik) okunur (başka kaynaklı graph'larda burada alınır)
+        log_rel.extend([_neg_log_rel(d, 'link_reliability') for d in edges])
+        data = G.nodes[n]
+        node_proc.append(data.get('processing_delay', 0))
+        node_log_rel.append(_neg_log_rel(data, 'reliability'))
+
+    bw = np.asarray(bw, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        res = np.where(bw > 0, 1000.0 / bw, 0.0)
+    csr = (
+        indptr,
+        np.asarray(indices, dtype=np.int32),
+        bw,
+        np.asarray(delay, dtype=float),
+        np.asarray(log_rel, dtype=float),
+        res,
+        np.asarray(node_proc, dtype=float),
+        np.asarray(node_log_rel, dtype=float),
+    )
+    _CSR_CACHE[G] = csr
+    return csr
+
 def load_graph(node_file, edge_file):
+    import pandas as pd
     print("Veriler yükleniyor...")
 
     # 1. DÜĞÜMLERİ OKU
@@ -30,33 +148,37 @@ def load_graph(node_file, edge_file):
     G = nx.Graph()
 
     # --- DÜĞÜMLERİ EKLEME (İndex bazlı: 0=ID, 1=Delay, 2=Reliability) ---
-    # İsim ne olursa olsun sıraya göre alır.
-    for i in range(len(nodes_df)):
-        try:
-            row = nodes_df.iloc[i]
-            n_id = int(row.iloc[0])           # 1. Sütun: ID
-            proc_delay = safe_float(row.iloc[1]) # 2. Sütun: İşlem Süresi
-            reliability = safe_float(row.iloc[2]) # 3. Sütun: Güvenilirlik
-            
-            G.add_node(n_id, processing_delay=proc_delay, reliability=reliability)
-        except Exception as e:
-            print(f"Satır {i} okunurken hata (Node): {e}")
+    # İsim ne olursa olsun sıraya göre alır. Satır satır iloc yerine sütunlar
+    # tek seferde NumPy dizisine çevrilir (her satır için Series oluşmaz).
+    n_ids, ok = _id_column(nodes_df.iloc[:, 0], "Node")       # 1. Sütun: ID
+    n_ids = n_ids[ok].astype(int)
+    proc_delay = safe_float_column(nodes_df.iloc[:, 1])[ok]   # 2. Sütun: İşlem Süresi
+    reliability = safe_float_column(nodes_df.iloc[:, 2])[ok]  # 3. Sütun: Güvenilirlik
+
+    # neg_log_rel: güvenilirlik maliyeti (-log R) yükleme sırasında 1 kez, sütun olarak hesaplanır;
+    # metrik hesapları yol başına math.log çağırmaz. Güvenilirlik sonradan değiştirilirse
+    # neg_log_rel de güncellenmelidir.
+    G.add_nodes_from(
+        (n, {"processing_delay": d, "reliability": r, "neg_log_rel": lr})
+        for n, d, r, lr in zip(n_ids.tolist(), proc_delay.tolist(), reliability.tolist(),
+                               neg_log(reliability).tolist())
+    )
 
     # --- KENARLARI EKLEME (İndex bazlı: 0=Source, 1=Target, 2=BW, 3=Delay, 4=Rel) ---
-    for i in range(len(edges_df)):
-        try:
-            row = edges_df.iloc[i]
-            u = int(row.iloc[0])            # 1. Sütun: Kaynak
-            v = int(row.iloc[1])            # 2. Sütun: Hedef
-            bw = safe_float(row.iloc[2])    # 3. Sütun: Bant Genişliği
-            delay = safe_float(row.iloc[3]) # 4. Sütun: Gecikme
-            rel = safe_float(row.iloc[4])   # 5. Sütun: Güvenilirlik
-
-            G.add_edge(u, v, bandwidth=bw, link_delay=delay, link_reliability=rel)
-        except Exception as e:
-            # Satır hatalıysa atla ama programı durdurma
-            print(f"Satır {i} okunurken hata (Edge): {e}")
-            continue
+    u, ok_u = _id_column(edges_df.iloc[:, 0], "Edge")         # 1. Sütun: Kaynak
+    v, ok_v = _id_column(edges_df.iloc[:, 1], "Edge")         # 2. Sütun: Hedef
+    ok = ok_u & ok_v
+    u = u[ok].astype(int)
+    v = v[ok].astype(int)
+    bw = safe_float_column(edges_df.iloc[:, 2])[ok]     # 3. Sütun: Bant Genişliği
+    delay = safe_float_column(edges_df.iloc[:, 3])[ok]  # 4. Sütun: Gecikme
+    rel = safe_float_column(edges_df.iloc[:, 4])[ok]    # 5. Sütun: Güvenilirlik
+
+    G.add_edges_from(
+        (a, b, {"bandwidth": c, "link_delay": d, "link_reliability": r, "neg_log_rel": lr})
+        for a, b, c, d, r, lr in zip(u.tolist(), v.tolist(), bw.tolist(), delay.tolist(), rel.tolist(),
+                                     neg_log(rel).tolist())
+    )
 
     print(f"Grafik BAŞARIYLA oluşturuldu: {G.number_of_nodes()} Düğüm, {G.number_of_edges()} Kenar.")
     
@@ -1,11 +1,17 @@
 
 import os
+import argparse
 import networkx as nx
 from graph_loader import load_graph
-from q_learning import QLearningAgent
+from q_learning import QLearningAgent, train_parallel
 from metrics import calculate_weighted_cost
 
 def main():
+    parser = argparse.ArgumentParser(description="Q-Learning ile QoS rotalama")
+    parser.add_argument("--num-workers", type=int, default=1,
+                        help="Paralel eğitilecek ajan (süreç) sayısı; 0: tüm çekirdekler")
+    args = parser.parse_args()
+
     # Dosya yolları
     base_path = os.path.dirname(os.path.abspath(__file__))
     node_file = os.path.join(base_path, 'BSM307_317_Guz2025_TermProject_NodeData.csv')
@@ -29,8 +35,12 @@ def main():
 
     # 3. Q-Learning Ajanını Oluştur ve Eğit
     # episodes=1000 ile ajan 1000 kere yolu bulmaya çalışıp öğrenecek
-    agent = QLearningAgent(G, source_node, target_node, episodes=1000)
-    agent.train()
+    # --num-workers > 1 ise bağımsız ajanlar paralel eğitilir, Q tabloları birleştirilir
+    if args.num_workers == 1:
+        agent = QLearningAgent(G, source_node, target_node, episodes=1000)
+        agent.train()
+    else:
+        agent = train_parallel(G, source_node, target_node, workers=args.num_workers, episodes=1000)
 
     # 4. En İyi Yolu Bul
     best_path = agent.get_best_path()
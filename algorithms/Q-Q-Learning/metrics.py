@@ -1,61 +1,109 @@
 import networkx as nx
 import math
+import weakref
+import numpy as np
+
+# Her graph için attribute dizileri 1 kez kurulur (graph silinince önbellekten de düşer).
+# Yol başına G[u][v].get(...) sözlük zinciri yerine: yol -> edge/node id'leri -> dizi toplamı.
+_ARRAY_CACHE = weakref.WeakKeyDictionary()
+
+
+def _graph_arrays(G):
+    """Graph'ın edge/node attribute'larını NumPy dizilerine çevirir (varsayılanlar aşağıdaki fonksiyonlarla aynı)."""
+    arrays = _ARRAY_CACHE.get(G)
+    if arrays is not None:
+        return arrays
+
+    node_index = {}
+    node_proc = []
+    node_log_rel = []
+    for node, data in G.nodes(data=True):
+        node_index[node] = len(node_index)
+        node_proc.append(data.get('processing_delay', 0))
+        # graph_loader.load_graph -log(güvenilirlik)'i 'neg_log_rel' olarak hazırlar; yoksa burada alınır
+        log_rel = data.get('neg_log_rel')
+        if log_rel is None:
+            rel = data.get('reliability', 0.99)
+            log_rel = -math.log(rel) if rel > 0 else 0.0
+        node_log_rel.append(log_rel)
+
+    edge_index = {}
+    link_delay = []
+    link_log_rel = []
+    link_res = []
+    for u, v, data in G.edges(data=True):
+        eid = len(link_delay)
+        edge_index[(u, v)] = eid
+        if not G.is_directed():
+            edge_index[(v, u)] = eid
+        link_delay.append(data.get('link_delay', 0))
+        log_rel = data.get('neg_log_rel')
+        if log_rel is None:
+            rel = data.get('link_reliability', 0.99)
+            log_rel = -math.log(rel) if rel > 0 else 0.0
+        link_log_rel.append(log_rel)
+        bw = data.get('bandwidth', 100) # Varsayılan 100 Mbps
+        link_res.append(1000.0 / bw if bw > 0 else 0.0)
+
+    # Aynı elemanın değerleri yan yana: bir yol için tek gather + tek toplam yeterli
+    # edge_tab sütunları: [link_delay, -log(link_rel), 1000/bw]; node_tab: [processing_delay, -log(rel)]
+    arrays = {
+        'node_index': node_index,
+        'edge_index': edge_index,
+        'node_tab': np.column_stack([node_proc, node_log_rel]).astype(float).reshape(-1, 2),
+        'edge_tab': np.column_stack([link_delay, link_log_rel, link_res]).astype(float).reshape(-1, 3),
+    }
+    _ARRAY_CACHE[G] = arrays
+    return arrays
+
+
+def _path_sums(arrays, path):
+    """
+    Yolun (delay, reliability_cost, resource_cost) toplamlarını döndürür.
+    Graph'ta olmayan edge/node -> KeyError (eski G[u][v] erişimindeki gibi).
+    """
+    node_index = arrays['node_index']
+    edge_index = arrays['edge_index']
+    node_ids = [node_index[n] for n in path]
+    edge_ids = [edge_index[(u, v)] for u, v in zip(path[:-1], path[1:])]
+
+    link_delay, link_rel, res = arrays['edge_tab'][edge_ids].sum(axis=0)
+    node_rows = arrays['node_tab'][node_ids]
+    # İşlem süresi: kaynak ve hedef hariç; güvenilirlik: tüm düğümler
+    proc = node_rows[1:-1, 0].sum()
+    node_rel = node_rows[:, 1].sum()
+    return float(link_delay + proc), float(link_rel + node_rel), float(res)
+
+
+def calculate_path_metrics(G, path):
+    """
+    (Toplam gecikme, güvenilirlik maliyeti, kaynak maliyeti) tek geçişte.
+    Üç calculate_* fonksiyonunu art arda çağırmak yerine (yol her seferinde id'lere çevrilir).
+    """
+    return _path_sums(_graph_arrays(G), path)
 
 def calculate_total_delay(G, path):
     """Toplam Gecikme: Link Gecikmeleri + Node İşlem Süreleri"""
-    total_delay = 0
-    
-    # 1. Link Gecikmeleri
-    for i in range(len(path) - 1):
-        u, v = path[i], path[i+1]
-        total_delay += G[u][v].get('link_delay', 0)
-        
-    # 2. Node İşlem Süreleri (Kaynak ve Hedef hariç - Doküman isteği)
-    # path[1:-1] -> İlk ve son düğümü hariç tutar
-    if len(path) > 2: #Eğer başlangıç ve bitiş haricinde bir düğüm varsa 
-        for node in path[1:-1]:
-            total_delay += G.nodes[node].get('processing_delay', 0)
-        
-    return total_delay
+    # Node İşlem Süreleri: Kaynak ve Hedef hariç - Doküman isteği
+    return _path_sums(_graph_arrays(G), path)[0]
 
 def calculate_reliability_cost(G, path):
     """Güvenilirlik Maliyeti: -log(R_link) + -log(R_node)"""
-    cost = 0
-    
-    # Link Güvenilirliği
-    for i in range(len(path) - 1):
-        u, v = path[i], path[i+1]
-        rel = G[u][v].get('link_reliability', 0.99)
-        if rel > 0:
-            cost += -math.log(rel)
-            
-    # Node Güvenilirliği (Hepsini dahil ediyoruz)
-    for node in path:
-        rel = G.nodes[node].get('reliability', 0.99)
-        if rel > 0:
-            cost += -math.log(rel)
-            
-    return cost
+    # Node Güvenilirliği: Hepsini dahil ediyoruz
+    return _path_sums(_graph_arrays(G), path)[1]
 
 def calculate_resource_cost(G, path):
     """Kaynak Maliyeti: 1000 / Bant Genişliği (Mbps)"""
-    cost = 0
-    for i in range(len(path) - 1):
-        u, v = path[i], path[i+1]
-        bw = G[u][v].get('bandwidth', 100) # Varsayılan 100 Mbps
-        if bw > 0:
-            # Dokümanda 1 Gbps / BW denmiş. 1 Gbps = 1000 Mbps.
-            cost += (1000.0 / bw)
-    return cost
+    # Dokümanda 1 Gbps / BW denmiş. 1 Gbps = 1000 Mbps.
+    return _path_sums(_graph_arrays(G), path)[2]
 
 def calculate_weighted_cost(G, path, w_delay=0.33, w_rel=0.33, w_res=0.34):
     """Ağırlıklı Toplam Maliyet"""
     if not path:
         return float('inf')
-        
-    d = calculate_total_delay(G, path)
-    r = calculate_reliability_cost(G, path)
-    res = calculate_resource_cost(G, path)
-    
+
+    # Üç metrik tek geçişte (yol id'lere 1 kez çevrilir)
+    d, r, res = _path_sums(_graph_arrays(G), path)
+
     total_cost = (w_delay * d) + (w_rel * r) + (w_res * res)
     return total_cost
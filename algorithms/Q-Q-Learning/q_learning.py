@@ -1,15 +1,55 @@
     # Yiğit Alakuş
+import os
+import collections
+import weakref
 import numpy as np
 import random
 import networkx as nx
+from concurrent.futures import ProcessPoolExecutor
 # Melek'in yazdığı metric.py dosyasını buraya bağlıyoruz
 from metric import MetricsEngine, Weights
+from graph_loader import node_index, to_csr
+import _ql_kernels
+
+
+# Ajanın sadece graph'a bağlı kısmı graph (ve min_bandwidth) başına 1 kez kurulur
+# (graph silinince önbellekten de düşer).
+_SHELL_CACHE = weakref.WeakKeyDictionary()
+
+
+def agent_shell(graph, min_bandwidth=0):
+    """
+    QLearningAgent'ın kaynak/hedef/ağırlıklardan bağımsız hazırlığı:
+    (düğümler, düğüm -> index, indptr, indices) — bant genişliği filtresi uygulanmış CSR.
+    Aynı graph üzerinde kurulan ajanlar (Streamlit yeniden çalıştırmaları, art arda istekler)
+    bunu paylaşır; diziler paylaşıldığı için yerinde değiştirilmemelidir.
+    """
+    shells = _SHELL_CACHE.get(graph)
+    if shells is None:
+        shells = _SHELL_CACHE[graph] = {}
+    shell = shells.get(min_bandwidth)
+    if shell is None:
+        nodes, node2idx = node_index(graph)
+        # Graph ve min_bandwidth eğitim boyunca değişmez: bant genişliği filtresi CSR dizileri
+        # üzerinde 1 kez uygulanır. Sonuç yine CSR (Numba çekirdeği için).
+        indptr, indices, bw = to_csr(graph)[:3]
+        keep = bw >= min_bandwidth
+        kept_before = np.concatenate(([0], np.cumsum(keep)))
+        shell = (nodes, node2idx, kept_before[indptr], indices[keep])
+        shells[min_bandwidth] = shell
+    return shell
+
 
 class QLearningAgent:
     def __init__(self, graph, source, target, episodes=500, alpha=0.1, gamma=0.9, 
-                 w_delay=0.33, w_rel=0.33, w_res=0.34, min_bandwidth=0):
+                 w_delay=0.33, w_rel=0.33, w_res=0.34, min_bandwidth=0,
+                 replay_k=0, replay_size=10000, early_stop=True):
         """
         Q-Learning Ajanı - Metric.py Entegreli Sürüm
+        replay_k > 0 ise her episod sonunda tampondan |TD hatası| öncelikli replay_k geçiş
+        için ek güncelleme yapılır (prioritized experience replay; varsayılan kapalı).
+        early_stop: episod ödülleri art arda birkaç pencere boyunca sabit kalırsa eğitim erken
+        biter; ayrıca hedefe varan bir yol bulununca episod adım sınırı 2 * yol uzunluğuna iner.
         """
         self.G = graph
         self.source = source
@@ -23,134 +63,403 @@ class QLearningAgent:
         self.engine = MetricsEngine(self.G)
         self.weights = Weights(w_delay, w_rel, w_res)
         
+        # Ajanın kendi üreteci (PCG64); Python'un random durumundan tohumlanır, böylece
+        # random.seed ile tekrar üretilebilirlik korunur. Python döngüsü sayıları episod
+        # başına toplu çeker (adım başına random.* çağrısı yok).
+        self.rng = np.random.default_rng(random.getrandbits(64))
+
         # Keşif Ayarları
         self.epsilon = 1.0
         self.epsilon_min = 0.01
         self.epsilon_decay = 0.995
         
-        self.q_table = {}
+        # Graph'a bağlı hazırlık (düğüm indeksi, filtreli CSR) önbellekten gelir (agent_shell)
+        self.nodes, self.node2idx, self.indptr, indices = agent_shell(self.G, self.min_bandwidth)
+
+        # Q tablosu: (durum, aksiyon) sözlüğü yerine düğüm indeksleriyle yoğun matris.
+        # Q[s, a] tek bir bellek okuması; hash + tuple oluşturma yok.
+        # float32: yarı bellek, Q[ns, komşular] okumalarında önbellek satırı başına 2 kat değer
+        # (ödül ölçeği ~1e4, float32 hassasiyeti yol seçimini değiştirmiyor).
+        self.Q = np.zeros((len(self.nodes), len(self.nodes)), dtype=np.float32)
+
+        # Komşu sırası düğüm başına 1 kez karıştırılır: greedy seçimde argmax eşitlikleri ilk
+        # indekse bozar, sıra rastgele olduğundan bu rastgele bir eşitlik bozma gibi davranır.
+        # (Karıştırma yeni bir dizi üretir; paylaşılan CSR değişmez.) Düğüm başına görünüm de burada.
+        owner = np.repeat(np.arange(len(self.nodes)), np.diff(self.indptr))
+        self.indices = indices[np.argsort(owner + self.rng.random(len(owner)))]
+        self.neighbors_arr = [
+            self.indices[self.indptr[i]:self.indptr[i + 1]] for i in range(len(self.nodes))
+        ]
+        self._reward_cache = {}  # yol (tuple) -> hedef ödülü
+        self._neighbors_cache = {}  # düğüm -> geçerli komşular (tuple), ilk istekte kurulur
         self.episode_rewards = [] 
 
+        # Erken durma: ödül penceresi (early_stop_window episod) art arda early_stop_patience
+        # kez max - min < early_stop_tol * |ortalama| olursa eğitim biter.
+        self.early_stop = early_stop
+        self.max_steps = 250     # episod başına adım sınırı (sonsuz döngü koruması)
+        self.early_stop_window = 50
+        self.early_stop_tol = 0.01
+        self.early_stop_patience = 3
+
+        # Öncelikli tekrar tamponu (halka): geçişler (s, a, r, s') + öncelikler
+        self.replay_k = replay_k
+        self.replay_size = replay_size
+        self.per_alpha = 0.6     # öncelik üssü (0: düzgün örnekleme)
+        self.per_beta0 = 0.4     # IS ağırlığı üssü; eğitim boyunca 1.0'a çıkar
+        self.per_eps = 1e-6      # sıfır TD hatalı geçişler de seçilebilsin
+
     def get_q(self, state, action):
-        return self.q_table.get((state, action), 0.0)
+        i = self.node2idx.get(state)
+        j = self.node2idx.get(action)
+        return 0.0 if i is None or j is None else float(self.Q[i, j])
 
     def get_valid_neighbors(self, state):
-        """Bant genişliği (Hız) kısıtlamasına göre komşuları filtreler"""
-        all_neighbors = list(self.G.neighbors(state))
-        valid_neighbors = []
-        
-        for n in all_neighbors:
-            edge_data = self.G[state][n]
-            # Veri setinde isim farklılıkları olabilir, hepsini kontrol et
-            bw = edge_data.get('bandwidth', edge_data.get('capacity_mbps', edge_data.get('bant_genisligi', 0)))
-            
-            if bw >= self.min_bandwidth:
-                valid_neighbors.append(n)
-                
-        return valid_neighbors
+        """Bant genişliği (Hız) kısıtlamasına göre komşuları filtreler (__init__'te 1 kez hesaplanır)"""
+        nbrs = self._neighbors_cache.get(state)
+        if nbrs is None:
+            nbrs = tuple(self.nodes[i] for i in self.neighbors_arr[self.node2idx[state]])
+            self._neighbors_cache[state] = nbrs
+        return nbrs
 
     def choose_action(self, state):
-        neighbors = self.get_valid_neighbors(state)
+        eps_roll, int_roll = self.rng.random(), int(self.rng.integers(0, 1 << 30))
+        action = self._choose_idx(self.node2idx[state], eps_roll, int_roll)
+        return None if action is None else self.nodes[action]
+
+    def _choose_idx(self, s, eps_roll, int_roll):
+        # eps_roll: [0, 1) düzgün sayı, int_roll: rastgele seçim için negatif olmayan tam sayı
+        neighbors = self.neighbors_arr[s]
         
-        if not neighbors:
+        if len(neighbors) == 0:
             return None # Gidecek yol yok (Tıkandı)
 
         # Epsilon-Greedy Stratejisi
-        if random.uniform(0, 1) < self.epsilon:
-            return random.choice(neighbors)
+        if eps_roll < self.epsilon:
+            return int(neighbors[int_roll % len(neighbors)])
         
-        q_values = [self.get_q(state, n) for n in neighbors]
-        max_q = max(q_values)
-        
-        # En iyileri seç (eşitlik varsa rastgele)
-        best_actions = [n for n, q in zip(neighbors, q_values) if q == max_q]
-        if not best_actions: return random.choice(neighbors)
-        return random.choice(best_actions)
+        # En iyiyi seç (eşitlikte ilk komşu; komşu sırası __init__'te karıştırıldı)
+        return int(neighbors[self.Q[s, neighbors].argmax()])
 
     def train(self):
         self.episode_rewards = [] # Grafik verisini sıfırla
+        if _ql_kernels.NUMBA_AVAILABLE:
+            return self._train_numba()
+        
+        src = self.node2idx[self.source]
+        dst = self.node2idx[self.target]
+        nodes = self.nodes
+        # Döngü kontrolü için düğüm başına 1 bayt: O(1) test/işaretleme, episod sonunda
+        # sadece yoldaki düğümler temizlenir
+        visited = np.zeros(len(nodes), dtype=np.bool_)
+        # Yol sadece düğüm indeksleriyle tutulur (tek liste); etiketli yol yalnızca hedefe
+        # varıldığında, ödül önbellekte yoksa kurulur (_terminal_reward)
+        path_idx = []
+        self._early_stop_reset()
+        # Rastgele sayılar bloklar halinde tek seferde çekilir; blok bitince yenilenir
+        # (episodlar çoğunlukla birkaç adımda bittiği için episod başına blok çekilmez)
+        block = 4096
+        step = block
+        if self.replay_k > 0:
+            self._replay_reset()
         
         for ep in range(self.episodes):
-            state = self.source
-            path = [state]
+            for i in path_idx:
+                visited[i] = False
+            state = src
+            path_idx = [state]
+            visited[state] = True
             total_reward_in_this_episode = 0
+            terminal_reward = None
+            loop_action = -1
             
-            while state != self.target:
-                action = self.choose_action(state)
+            while state != dst:
+                if step == block:
+                    eps_rolls = self.rng.random(block).tolist()
+                    int_rolls = self.rng.integers(0, 1 << 30, block).tolist()
+                    step = 0
+                action = self._choose_idx(state, eps_rolls[step], int_rolls[step])
+                step += 1
                 if action is None:
                     break 
                 
                 next_state = action
                 
                 # Döngü Engelleme (Kendi kuyruğunu ısırmasın)
-                if next_state in path:
+                if visited[next_state]:
                     reward = -1000
-                    self.update_q(state, action, reward, next_state)
+                    self._update(state, action, reward, next_state)
                     total_reward_in_this_episode += reward
+                    loop_action = action
                     break 
                 
-                path.append(next_state)
+                path_idx.append(next_state)
+                visited[next_state] = True
                 
                 # --- ÖDÜL MEKANİZMASI (METRIC.PY KULLANILIYOR) ---
-                if next_state == self.target:
-                    # Hedefe ulaştı! Tüm yolun maliyetini metric.py ile hesapla
-                    # Bu sayede Melek'in yazdığı formüller ödülü belirler.
-                    try:
-                        metrics = self.engine.compute(path, demand_mbps=self.min_bandwidth)
-                        total_cost = self.engine.weighted_sum(metrics, self.weights)
-                        # Maliyet ne kadar azsa, ödül o kadar büyük olsun
-                        reward = 10000.0 / (total_cost + 1e-9)
-                    except:
-                        # Eğer metric.py hesaplarken hata verirse (veri eksikliği vb.)
-                        reward = 100.0
+                if next_state == dst:
+                    reward = terminal_reward = self._terminal_reward(path_idx)
                 else:
                     # Hedefe daha varmadıysa küçük bir adım cezası ver (yolu uzatmasın)
                     reward = -1 
 
-                self.update_q(state, action, reward, next_state)
+                self._update(state, action, reward, next_state)
                 total_reward_in_this_episode += reward
                 state = next_state
                 
-                if len(path) > 250: break # Sonsuz döngü koruması
+                if len(path_idx) > self._step_cap: break # Sonsuz döngü koruması
             
             self.episode_rewards.append(total_reward_in_this_episode)
 
+            if self.replay_k > 0:
+                self._remember(path_idx, terminal_reward, loop_action)
+                self._replay(ep / self.episodes)
+
             # Epsilon azaltma (Zamanla daha az rastgele, daha çok akıllı davran)
             if self.epsilon > self.epsilon_min:
                 self.epsilon *= self.epsilon_decay
 
+            if self._episode_done(total_reward_in_this_episode,
+                                  len(path_idx) if terminal_reward is not None else 0):
+                break
+
+    def _early_stop_reset(self):
+        self._step_cap = self.max_steps
+        self._window = collections.deque(maxlen=self.early_stop_window)
+        self._stable_windows = 0
+
+    def _episode_done(self, total, reached_len):
+        """
+        Episod sonu kontrolü. reached_len: hedefe varıldıysa yolun düğüm sayısı (yoksa 0).
+        Adım sınırını günceller; eğitim durmalıysa True döner.
+        """
+        if not self.early_stop:
+            return False
+        # Bilinen en kısa hedef yolunun 2 katından uzun yürüyüşler boşa adım
+        if reached_len:
+            self._step_cap = min(self._step_cap, 2 * reached_len)
+
+        window = self._window
+        window.append(total)
+        # Pencereler üst üste binmeden kontrol edilir (her early_stop_window episodda bir)
+        if len(window) < window.maxlen or len(self.episode_rewards) % window.maxlen:
+            return False
+        mean = sum(window) / len(window)
+        if max(window) - min(window) < self.early_stop_tol * abs(mean):
+            self._stable_windows += 1
+        else:
+            self._stable_windows = 0
+        return self._stable_windows >= self.early_stop_patience
+
+    def _terminal_reward(self, path_idx):
+        # Epsilon düştükçe aynı yollar tekrar tekrar bulunur: ödül yol başına 1 kez hesaplanır.
+        # path_idx düğüm indeksleri; anahtar da indekslerden, düğüm etiketleri sadece ilk seferde.
+        key = tuple(path_idx)
+        reward = self._reward_cache.get(key)
+        if reward is not None:
+            return reward
+        path = [self.nodes[i] for i in key]
+
+        # Hedefe ulaştı! Tüm yolun maliyetini metric.py ile hesapla
+        # Bu sayede Melek'in yazdığı formüller ödülü belirler.
+        try:
+            metrics = self.engine.compute(path, demand_mbps=self.min_bandwidth)
+            total_cost = self.engine.weighted_sum(metrics, self.weights)
+            # Maliyet ne kadar azsa, ödül o kadar büyük olsun
+            reward = 10000.0 / (total_cost + 1e-9)
+        except:
+            # Eğer metric.py hesaplarken hata verirse (veri eksikliği vb.)
+            reward = 100.0
+        self._reward_cache[key] = reward
+        return reward
+
+    def _train_numba(self):
+        """train() ile aynı döngü; adımlar _ql_kernels.run_episode içinde derlenmiş kodda çalışır."""
+        src = self.node2idx[self.source]
+        dst = self.node2idx[self.target]
+        nodes = self.nodes
+        indptr, indices = self.indptr, self.indices
+        self._early_stop_reset()
+        path_buf = np.empty(min(len(nodes), self.max_steps + 1), dtype=np.int32)
+        visited = np.zeros(len(nodes), dtype=np.bool_)
+        _ql_kernels.seed(random.randrange(2**31))  # random.seed ile tekrar üretilebilirlik
+        if self.replay_k > 0:
+            self._replay_reset()
+
+        for ep in range(self.episodes):
+            status, L, total, loop_action = _ql_kernels.run_episode(
+                self.Q, indptr, indices, src, dst, self.epsilon, self.alpha, self.gamma,
+                self._step_cap, path_buf, visited)
+
+            reward = None
+            if status == _ql_kernels.REACHED:
+                # Episodun son güncellemesi: ödül yolun metric maliyetinden
+                reward = self._terminal_reward(path_buf[:L].tolist())
+                self._update(int(path_buf[L - 2]), dst, reward, dst)
+                total += reward
+
+            self.episode_rewards.append(total)
+
+            if self.replay_k > 0:
+                self._remember(path_buf[:L], reward, loop_action)
+                self._replay(ep / self.episodes)
+
+            # Epsilon azaltma (Zamanla daha az rastgele, daha çok akıllı davran)
+            if self.epsilon > self.epsilon_min:
+                self.epsilon *= self.epsilon_decay
+
+            if self._episode_done(total, L if reward is not None else 0):
+                break
+
+    def _replay_reset(self):
+        size = self.replay_size
+        self._buf_s = np.zeros(size, dtype=np.int32)
+        self._buf_a = np.zeros(size, dtype=np.int32)
+        self._buf_r = np.zeros(size, dtype=np.float64)
+        self._buf_ns = np.zeros(size, dtype=np.int32)
+        self._buf_prio = np.zeros(size, dtype=np.float64)  # p^alpha olarak saklanır
+        self._buf_n = 0
+        self._buf_pos = 0
+        self._max_prio = 1.0
+
+    def _remember(self, path_idx, terminal_reward, loop_action):
+        """
+        Episodun geçişlerini tampona ekler (yeni geçişler en yüksek öncelikle girer).
+        path_idx: episodda yürünen düğüm indeksleri; terminal_reward: hedefe varıldıysa son
+        adımın ödülü (yoksa None); loop_action: döngüye giren aksiyon (yoksa -1).
+        """
+        path_idx = np.asarray(path_idx, dtype=np.int32)
+        S, A = path_idx[:-1], path_idx[1:]
+        R = np.full(len(S), -1.0)
+        if terminal_reward is not None:
+            R[-1] = terminal_reward
+        if loop_action >= 0:
+            S = np.append(S, path_idx[-1])
+            A = np.append(A, loop_action)
+            R = np.append(R, -1000.0)
+
+        slots = (self._buf_pos + np.arange(len(S))) % self.replay_size
+        self._buf_s[slots] = S
+        self._buf_a[slots] = A
+        self._buf_r[slots] = R
+        self._buf_ns[slots] = A
+        self._buf_prio[slots] = self._max_prio
+        self._buf_pos = (self._buf_pos + len(S)) % self.replay_size
+        self._buf_n = min(self._buf_n + len(S), self.replay_size)
+
+    def _replay(self, progress):
+        """Önceliğe (p^alpha) göre replay_k geçiş seçip IS ağırlıklı ek güncelleme uygular."""
+        n = self._buf_n
+        if n == 0:
+            return
+        p = self._buf_prio[:n]
+        cdf = np.cumsum(p)
+        batch = np.searchsorted(cdf, self.rng.random(self.replay_k) * cdf[-1], side='right')
+        batch = np.minimum(batch, n - 1)
+
+        # Önem örneklemesi (IS) düzeltmesi: w_i = (N * P(i))^-beta, en büyüğü 1 olacak şekilde
+        beta = self.per_beta0 + (1.0 - self.per_beta0) * progress
+        w = (n * p[batch] / cdf[-1]) ** -beta
+        w /= w.max()
+
+        _ql_kernels.replay(self.Q, self.indptr, self.indices, self._buf_s, self._buf_a,
+                           self._buf_r, self._buf_ns, batch, w, self.alpha, self.gamma,
+                           self._buf_prio, self.per_eps, self.per_alpha)
+        self._max_prio = max(self._max_prio, self._buf_prio[batch].max())
+
     def update_q(self, state, action, reward, next_state):
-        old_q = self.get_q(state, action)
+        idx = self.node2idx
+        self._update(idx[state], idx[action], reward, idx[next_state])
+
+    def _update(self, s, a, reward, ns):
+        old_q = self.Q[s, a]
         
-        next_neighbors = self.get_valid_neighbors(next_state)
-        if next_neighbors:
-            max_future_q = max([self.get_q(next_state, n) for n in next_neighbors])
+        next_neighbors = self.neighbors_arr[ns]
+        if len(next_neighbors):
+            max_future_q = self.Q[ns, next_neighbors].max()
         else:
             max_future_q = 0
         
         # Q-Learning Formülü
-        new_q = old_q + self.alpha * (reward + self.gamma * max_future_q - old_q)
-        self.q_table[(state, action)] = new_q
+        self.Q[s, a] = old_q + self.alpha * (reward + self.gamma * max_future_q - old_q)
 
     def get_best_path(self):
         """Eğitimden sonra öğrenilen en iyi yolu çıkarır"""
-        path = [self.source]
-        state = self.source
-        visited = {state}
+        state = self.node2idx[self.source]
+        path_idx = [state]  # indekslerle yürünür, etiketler en sonda
+        dst = self.node2idx[self.target]
+        visited = np.zeros(len(self.nodes), dtype=bool)
+        visited[state] = True
         
-        while state != self.target:
-            neighbors = self.get_valid_neighbors(state)
-            valid_neighbors = [n for n in neighbors if n not in visited]
+        while state != dst:
+            neighbors = self.neighbors_arr[state]
+            valid_neighbors = neighbors[~visited[neighbors]]
             
-            if not valid_neighbors: return None
+            if len(valid_neighbors) == 0: return None
             
-            # Q tablosuna bakarak en yüksek puanlı komşuyu seç
-            best_next = max(valid_neighbors, key=lambda n: self.get_q(state, n))
+            # Q tablosuna bakarak en yüksek puanlı komşuyu seç (eşitlikte ilk komşu)
+            best_next = int(valid_neighbors[self.Q[state, valid_neighbors].argmax()])
             
-            path.append(best_next)
-            visited.add(best_next)
+            path_idx.append(best_next)
+            visited[best_next] = True
             state = best_next
             
-            if len(path) > len(self.G.nodes): return None
+            if len(path_idx) > len(self.nodes): return None
             
-        return path
+        return [self.nodes[i] for i in path_idx]
+
+
+# --- PARALEL EĞİTİM (Bağımsız ajanlar, farklı seed'ler) ---
+# Her süreç graph'ı 1 kez alır (initializer); görev başına sadece kaynak/hedef/ayarlar/seed gider.
+# Havuz graph'a bağlı olduğu için aynı graph üzerinde tekrar tekrar kullanılabilir (make_pool).
+_worker_graph = None
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+def _train_worker(args):
+    source, target, agent_kwargs, seed = args
+    random.seed(seed)
+    agent = QLearningAgent(_worker_graph, source, target, **agent_kwargs)
+    agent.train()
+    return agent.Q, agent.episode_rewards
+
+def make_pool(graph, workers=0):
+    """graph'ı 1 kez yüklemiş süreç havuzu (train_parallel'e pool= olarak verilebilir)."""
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph,))
+
+def train_parallel(graph, source, target, workers=0, pool=None, **agent_kwargs):
+    """
+    workers adet bağımsız ajanı ayrı süreçlerde eğitir ve Q tablolarını
+    eleman bazında max ile birleştirir. En iyi yol birleşik tablodan çıkarılır.
+    workers <= 0 -> tüm çekirdekler; workers == 1 -> normal (seri) eğitim.
+    pool: make_pool(graph) ile açılmış havuz (verilmezse çağrı boyunca geçici havuz açılır).
+    Dönüş: eğitilmiş QLearningAgent (get_best_path() birleşik Q'yu kullanır).
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    agent = QLearningAgent(graph, source, target, **agent_kwargs)
+    if workers == 1:
+        agent.train()
+        return agent
+
+    # Seed'ler çağıranın random durumundan türetilir (random.seed ile tekrar üretilebilir)
+    tasks = [(source, target, agent_kwargs, random.getrandbits(32)) for _ in range(workers)]
+    if pool is None:
+        with make_pool(graph, workers) as tmp_pool:
+            results = list(tmp_pool.map(_train_worker, tasks))
+    else:
+        results = list(pool.map(_train_worker, tasks))
+
+    agent.Q = np.maximum.reduce([q for q, _ in results])
+    # Grafik için ajanların episod ödüllerinin ortalaması (erken duran ajanların
+    # listeleri kısa olabilir; eksik episodlar NaN ile doldurulup ortalamaya katılmaz)
+    rewards = np.full((len(results), max(len(r) for _, r in results)), np.nan)
+    for i, (_, r) in enumerate(results):
+        rewards[i, :len(r)] = r
+    agent.episode_rewards = np.nanmean(rewards, axis=0).tolist()
+    return agent
@@ -3,9 +3,10 @@ import networkx as nx
 import plotly.graph_objects as go
 import time
 import os
+import threading
 import numpy as np
 from graph_loader import load_graph
-from q_learning import QLearningAgent
+from q_learning import QLearningAgent, agent_shell, make_pool, train_parallel
 from metrics import calculate_weighted_cost, calculate_total_delay, calculate_reliability_cost, calculate_resource_cost
 
 # --- SAYFA AYARLARI ---
@@ -32,12 +33,17 @@ base_path = os.path.dirname(os.path.abspath(__file__))
 node_file = os.path.join(base_path, 'BSM307_317_Guz2025_TermProject_NodeData.csv')
 edge_file = os.path.join(base_path, 'BSM307_317_Guz2025_TermProject_EdgeData.csv')
 
+# Düğüm listesi de graph ile birlikte 1 kez kurulur (her yeniden çalıştırmada list(G.nodes()) yok).
+# Ajanın graph'a bağlı hazırlığı (indeks + CSR) da burada kurulur; graph önbellekte kaldığı sürece
+# her buton/slider değişikliğinde kurulan ajan bunu hazır bulur.
 @st.cache_resource
 def get_graph():
-    return load_graph(node_file, edge_file)
+    G = load_graph(node_file, edge_file)
+    agent_shell(G)
+    return G, tuple(G.nodes())
 
 try:
-    G = get_graph()
+    G, all_nodes = get_graph()
 except Exception as e:
     st.error(f"Veri yüklenemedi: {e}")
     st.stop()
@@ -46,7 +52,6 @@ except Exception as e:
 st.sidebar.header("🎛️ Kontrol Paneli")
 
 st.sidebar.subheader("1. Rota ve Talep")
-all_nodes = list(G.nodes())
 source = st.sidebar.selectbox("Başlangıç (S)", all_nodes, index=0)
 target = st.sidebar.selectbox("Hedef (D)", all_nodes, index=len(all_nodes)-1)
 
@@ -71,18 +76,48 @@ st.sidebar.divider()
 st.sidebar.subheader("3. Yapay Zeka")
 episodes = st.sidebar.slider("Eğitim Turu", 100, 2000, 500)
 alpha = st.sidebar.slider("Öğrenme Hızı", 0.01, 1.0, 0.1)
+# Tek çekirdekte slider gösterilmez (min_value == max_value olamaz), seri eğitim kullanılır
+cpu_count = os.cpu_count() or 1
+num_workers = st.sidebar.slider("Paralel Ajan", 1, cpu_count, 1) if cpu_count > 1 else 1
+
+# Süreç havuzu graph'ı 1 kez yükler ve oturumlar arası tekrar kullanılır.
+# Önbellekte tek havuz tutulur: boyut değişince eskisi kapatılıp yenisi açılır
+# (slider'ın her değeri için ayrı, kapanmayan ve graph kopyası tutan havuz birikmez).
+@st.cache_resource
+def _pool_slot():
+    return {"pool": None, "workers": 0, "lock": threading.Lock()}
+
+def get_pool(workers):
+    slot = _pool_slot()
+    with slot["lock"]:
+        if slot["pool"] is None or slot["workers"] != workers:
+            if slot["pool"] is not None:
+                slot["pool"].shutdown()
+            slot["pool"] = make_pool(G, workers)
+            slot["workers"] = workers
+        return slot["pool"]
 
 # --- GRAFİK FONKSİYONU ---
-def draw_neon_graph(G, path=None):
-    pos = nx.spring_layout(G, seed=42)
-    node_x, node_y, node_text, node_color, node_size = [], [], [], [], []
-    for node in G.nodes():
+# Yerleşim (spring_layout, O(n²·iter)) ve düğüm koordinat/etiketleri graph başına 1 kez hesaplanır;
+# her istekte sadece renkler ve yol çizgisi yeniden kurulur.
+# _G: alt çizgili parametre Streamlit tarafından hash'lenmez (graph zaten tek ve önbellekte).
+@st.cache_resource
+def get_layout(_G):
+    pos = nx.spring_layout(_G, seed=42)
+    node_x, node_y, node_text = [], [], []
+    for node in _G.nodes():
         x, y = pos[node]
         node_x.append(x)
         node_y.append(y)
-        info = f"<b>Node {node}</b><br>Delay: {G.nodes[node].get('processing_delay')}ms"
-        node_text.append(info)
-        if path and node in path:
+        node_text.append(f"<b>Node {node}</b><br>Delay: {_G.nodes[node].get('processing_delay')}ms")
+    return pos, node_x, node_y, node_text
+
+def draw_neon_graph(G, path=None):
+    pos, node_x, node_y, node_text = get_layout(G)
+    node_color, node_size = [], []
+    path_nodes = set(path) if path else ()
+    for node in G.nodes():
+        if node in path_nodes:
             if node == path[0]: node_color.append('#00FF00'); node_size.append(20)
             elif node == path[-1]: node_color.append('#FF0055'); node_size.append(20)
             else: node_color.append('#00D2FF'); node_size.append(12)
@@ -117,9 +152,15 @@ with col1:
         else:
             with st.spinner(f'Yapay Zeka tüm ağı tarıyor...'):
                 # KISITLAMA KALDIRILDI: Sadece grafiği ve ağırlıkları gönderiyoruz
-                agent = QLearningAgent(G, source, target, episodes=episodes, alpha=alpha, 
-                                     w_delay=w_delay, w_rel=w_rel, w_res=w_res)
-                agent.train()
+                if num_workers == 1:
+                    agent = QLearningAgent(G, source, target, episodes=episodes, alpha=alpha, 
+                                         w_delay=w_delay, w_rel=w_rel, w_res=w_res)
+                    agent.train()
+                else:
+                    # Bağımsız ajanlar paralel eğitilir, Q tabloları birleştirilir
+                    agent = train_parallel(G, source, target, workers=num_workers, pool=get_pool(num_workers),
+                                           episodes=episodes, alpha=alpha,
+                                           w_delay=w_delay, w_rel=w_rel, w_res=w_res)
                 path = agent.get_best_path()
 
             if path:
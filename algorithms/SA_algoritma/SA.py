@@ -1,7 +1,12 @@
 # algorithms/SA_algoritma/SA.py
+import heapq
 import math
+import os
 import random
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
+import numpy as np
 from typing import Optional, List, Tuple
 from metrics.metric import MetricsEngine, Weights
 
@@ -67,6 +72,79 @@ def build_feasible_subgraph(G: nx.Graph, demand: Optional[float]) -> nx.Graph:
     return H
 
 
+# ==================================================
+# CSR GÖRÜNÜMÜ + HEDEFE EN KISA YOLLAR
+# ==================================================
+# Graph başına 1 kez kurulur (graph silinince önbellekten de düşer).
+_CSR_CACHE = weakref.WeakKeyDictionary()
+
+
+def _reverse_csr(G: nx.Graph):
+    """
+    Hedefe doğru (ters yönde) Dijkstra için CSR dizileri:
+    (düğümler, düğüm -> index, indptr, indices, link_delay, bandwidth).
+    i'nin komşuları indices[indptr[i]:indptr[i+1]]; yönlü graph'ta i'ye gelen kenarlar.
+    Ağırlık: "link_delay" (yoksa 1, networkx'teki gibi); bant genişliği path_is_feasible ile aynı.
+    Sonuç graph başına önbellekte (attribute'lar sonradan değişirse yansımaz).
+    """
+    cached = _CSR_CACHE.get(G)
+    if cached is not None:
+        return cached
+    nodes = list(G.nodes())
+    node2idx = {n: i for i, n in enumerate(nodes)}
+    adj = G.pred if G.is_directed() else G.adj
+    indptr = [0]
+    indices, delay, bw = [], [], []
+    for n in nodes:
+        nbrs = adj[n]
+        indices.extend(map(node2idx.__getitem__, nbrs))
+        for a in nbrs.values():
+            delay.append(a.get("link_delay", 1))
+            bw.append(a.get("bandwidth", a.get("bandwidth_mbps", 0)))
+        indptr.append(len(indices))
+    cached = (nodes, node2idx, indptr, indices, delay, np.asarray(bw, dtype=float))
+    _CSR_CACHE[G] = cached
+    return cached
+
+
+def _next_hops_to_target(G: nx.Graph, target, demand: Optional[float]):
+    """
+    Tüm düğümlerden target'a link_delay'e göre en kısa yollar, tek Dijkstra ile (target'tan
+    ters yönde). Dönüş: (düğümler, düğüm -> index, nxt); nxt[i]: i'den target'a giderken bir
+    sonraki düğümün indeksi (target için kendisi, ulaşılamayanlar için -1).
+    demand varsa bant genişliği yetmeyen kenarlar yok sayılır (build_feasible_subgraph ile aynı
+    filtre, ama alt graph kurulmadan: filtre CSR üzerinde maske).
+    """
+    nodes, node2idx, indptr, indices, delay, bw = _reverse_csr(G)
+    if target not in node2idx:
+        raise nx.NodeNotFound(f"Hedef {target} graph'ta yok")
+    ok = (bw >= float(demand)).tolist() if demand is not None else None
+
+    n = len(nodes)
+    dist = [math.inf] * n
+    nxt = [-1] * n
+    done = [False] * n
+    t = node2idx[target]
+    dist[t] = 0.0
+    nxt[t] = t
+    heap = [(0.0, t)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        for k in range(indptr[u], indptr[u + 1]):
+            if ok is not None and not ok[k]:
+                continue
+            v = indices[k]
+            nd = d + delay[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                nxt[v] = u
+                heapq.heappush(heap, (nd, v))
+    return nodes, node2idx, nxt
+
+
 # ==================================================
 # SIMULATED ANNEALING (HARD CONSTRAINT)
 # ==================================================
@@ -80,84 +158,127 @@ def simulated_annealing(
     T0: float = 5.0,
     alpha: float = 0.995,
     max_iter: int = 5000,
+    patience: Optional[int] = 400,
+    engine: Optional[MetricsEngine] = None,
 ) -> Tuple[Optional[List[int]], float, Optional[object]]:
     """
     Fungsi simulated_annealing, graph, source ve target alarak Simulated Annealing algoritmasını çalıştırır.
     weights metriklerin önemini, demand_mbps ise bant genişliği kısıtını belirler. 
     T0, alpha ve max_iter algoritmanın keşif davranışını kontrol eder. 
+    patience: best bu kadar iterasyon iyileşmezse sıcaklık 1 kez T0 / 2'ye yükseltilir,
+    ikinci duraklamada döngü erken biter (None: erken bitiş yok, max_iter / T sınırına kadar).
+    engine: G için hazır MetricsEngine (aynı graph üzerinde tekrar eden run'larda attribute
+    dizileri her çağrıda yeniden kurulmaz). Verilmezse burada kurulur.
     Fonksiyon, en iyi yolu, bu yolun maliyetini ve hesaplanan metrikleri döndürür.
 
     """
 
     # Metrikleri hesaplayacak motor (delay, reliability, resource vs.)
-    engine = MetricsEngine(G)
-
-    # ---- HARD FILTER GRAPH ----
-    # demand varsa: uygun olmayan kenarlar çıkarıldı.
-    Gf = build_feasible_subgraph(G, demand_mbps)
+    engine = engine or MetricsEngine(G)
+
+    # ---- HARD FILTER + EN KISA YOLLAR ----
+    # Tüm "x -> target" en kısa yolları (link_delay) tek bir Dijkstra ile, graph'ın önbellekteki
+    # CSR görünümü üzerinde (demand'i sağlamayan kenarlar maskeyle atlanır; alt graph kurulmaz).
+    # nxt[x], x'ten target'a doğru bir sonraki düğüm. Graph sabit, pivot'lar çok tekrar ediyor:
+    # döngüde her iterasyonda Dijkstra yerine nxt zinciri yürünür, sonuç da önbelleğe alınır.
+    nodes, node2idx, nxt = _next_hops_to_target(G, target, demand_mbps)
+    tails = {}
+
+    def tail_from(node):
+        tail = tails.get(node)
+        if tail is None:
+            i = node2idx.get(node, -1)
+            if i < 0 or nxt[i] < 0:
+                raise nx.NetworkXNoPath(f"{node} -> {target} yolu yok")
+            idx = [i]
+            while nodes[idx[-1]] != target:
+                idx.append(nxt[idx[-1]])
+            tail = [nodes[j] for j in idx]
+            tails[node] = tail
+        return tail
 
     # İlk çözümü link_delay ağırlığına göre en kısa yol yapıyor.
     try:
-        current = nx.shortest_path(Gf, source, target, weight="link_delay")
+        current = tail_from(source)[:]
     except nx.NetworkXNoPath:
         # Eğer demand yüzünden yol yoksa → direkt “no solution”.
         return None, float("inf"), None
 
-    # Başlangıç yolunun metriklerini ve skorunu hesapla
-    current_m = engine.compute(current, demand_mbps=demand_mbps)
-    current_score = engine.weighted_sum(current_m, weights)
+    # Başlangıç yolunun skorunu hesapla.
+    # Döngüde sadece skor gerekiyor: weighted_score, compute + weighted_sum ile aynı skoru
+    # tek geçişte verir. PathMetrics en sonda sadece best için hesaplanır.
+    current_score = engine.weighted_score(current, weights, demand_mbps=demand_mbps)
 
     # Şu anki çözümü en iyisi sayıp kenara koyuyoruz
     best = current[:]
     best_score = current_score
-    best_m = current_m
 
     # Başlangıç sıcaklığı
     T = T0
 
+    # Rastgele sayılar iterasyon başına random.* çağrısı yerine baştan toplu üretilir (PCG64).
+    # Üreteç Python'un random durumundan tohumlanır: random.seed ile tekrar üretilebilirlik korunur.
+    rng = np.random.default_rng(random.getrandbits(64))
+    pivot_rolls = rng.random(max_iter).tolist()
+    # Kabul testi log uzayında: u < exp(-delta / T)  <=>  T * log(u) < -delta (T > 0).
+    # log(u) tüm iterasyonlar için tek vektörel çağrıyla alınır; döngüde exp çağrısı yok.
+    with np.errstate(divide='ignore'):
+        accept_logs = np.log(rng.random(max_iter)).tolist()
+
+    # Erken bitiş: best'in iyileşmediği ardışık iterasyon sayısı (stale) patience'ı aşarsa
+    # önce 1 kez yeniden ısıtılır (T = T0 / 2), tekrar duraklarsa aramaya son verilir.
+    stale = 0
+    reheated = False
+
     # Her iterasyonda “komşu çözüm” üretip kabul edip etmeyeceğine bakıyor.
-    for _ in range(max_iter):
+    for it in range(max_iter):
         # Yol sadece [source, target] gibi ise pivot seçip parçalamak mantıksız.
         if len(current) <= 2:
             break
 
+        if patience is not None and stale > patience:
+            if reheated:
+                break
+            T = max(T, T0 * 0.5)
+            reheated = True
+            stale = 0
+        stale += 1
+
         # Komşu üretimi:
         # current yolunun içinden rastgele bir pivot seçiyoruz (baş ve son hariç)
-        i = random.randint(1, len(current) - 2)
+        i = 1 + int(pivot_rolls[it] * (len(current) - 2))
         pivot = current[i]
 
-        # Pivot -> target arasını yeniden shortest_path ile hesaplayıp
+        # Pivot -> target arasını en kısa yol ile alıp (önbellekten)
         # current[:i] ile birleştirerek yeni aday yol oluşturuyoruz
         try:
-            tail = nx.shortest_path(Gf, pivot, target, weight="link_delay")
+            tail = tail_from(pivot)
             candidate = current[:i] + tail
         except nx.NetworkXNoPath:
             # Pivot'tan target'a giden yol yoksa bu iterasyonu geç, sıcaklığı düşürür.
             T *= alpha
             continue
 
-        # Ek güvenlik kontrolü:
-        # (Normalde Gf zaten filtreli, ama yine de kesin olsun diye kontrol ediyoruz)
-        if not path_is_feasible(G, candidate, demand_mbps):
-            T *= alpha
-            continue
+        # Ek güvenlik kontrolü gerekmiyor: current ve tail'in tüm kenarları demand filtresinden
+        # geçmiş kenarlar -> candidate yapı gereği feasible. (Kontrol her iterasyonda
+        # yolun tüm kenarlarını dolaşıyordu; sonda best için 1 kez yapılıyor.)
 
-        # Aday yolun metriklerini ve skorunu hesapla
-        cand_m = engine.compute(candidate, demand_mbps=demand_mbps)
-        cand_score = engine.weighted_sum(cand_m, weights)
+        # Aday yolun skorunu hesapla
+        cand_score = engine.weighted_score(candidate, weights, demand_mbps=demand_mbps)
 
         # Skor farkı: negatifse aday daha iyi (minimizasyon varsayımı)
         delta = cand_score - current_score
 
         # Kabul kriteri:
         # - aday daha iyiyse (delta < 0) direkt kabul
-        # - daha kötüyse de bazen kabul edebilir (exp(-delta/T)) -> SA'nın kaçış mekanizması
-        if delta < 0 or random.random() < math.exp(-delta / max(T, 1e-9)):
+        # - daha kötüyse de bazen kabul edebilir (olasılık exp(-delta/T)) -> SA'nın kaçış mekanizması
+        if delta < 0 or accept_logs[it] * max(T, 1e-9) < -delta:
             current, current_score = candidate, cand_score
 
             # Eğer kabul edilen aday en iyiden de iyiyse best'i güncelle
             if cand_score < best_score:
-                best, best_score, best_m = candidate[:], cand_score, cand_m
+                best, best_score = candidate[:], cand_score
+                stale = 0
 
         # Sıcaklığı düşür (cooling)
         # çok küçülürse artık rastgele kabul etme neredeyse yok → dur.
@@ -170,4 +291,56 @@ def simulated_annealing(
     if not path_is_feasible(G, best, demand_mbps):
         return None, float("inf"), None
 
+    best_m = engine.compute(best, demand_mbps=demand_mbps)
     return best, best_score, best_m
+
+
+# ==================================================
+# PARALEL SA ZİNCİRLERİ
+# ==================================================
+# Her süreç graph'ı 1 kez alır (initializer); görev başına sadece seed gönderilir.
+_worker_args = None
+
+
+def _init_worker(G, source, target, sa_kwargs):
+    global _worker_args
+    _worker_args = (G, source, target, sa_kwargs)
+
+
+def _sa_worker(seed: int):
+    G, source, target, sa_kwargs = _worker_args
+    random.seed(seed)
+    return simulated_annealing(G, source, target, **sa_kwargs)
+
+
+def simulated_annealing_parallel(
+    G: nx.Graph,
+    source,
+    target,
+    *,
+    workers: int = 0,
+    engine: Optional[MetricsEngine] = None,
+    **sa_kwargs,
+) -> Tuple[Optional[List[int]], float, Optional[object]]:
+    """
+    workers adet bağımsız SA zincirini (farklı seed'lerle) ayrı süreçlerde çalıştırır
+    ve en düşük skorlu sonucu döndürür. Parametreler simulated_annealing ile aynıdır.
+
+    - workers <= 0: tüm çekirdekler kullanılır.
+    - workers == 1: tek zincir, doğrudan simulated_annealing çağrılır (süreç açılmaz).
+    - engine: sadece tek zincirde kullanılır; işçi süreçler kendi engine'lerini kurar
+      (engine'i dizileriyle birlikte her sürece göndermek yerine).
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    if workers == 1:
+        return simulated_annealing(G, source, target, engine=engine, **sa_kwargs)
+
+    # Seed'ler çağıranın random durumundan türetilir (random.seed ile tekrar üretilebilir)
+    seeds = [random.getrandbits(32) for _ in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(G, source, target, sa_kwargs)) as pool:
+        results = list(pool.map(_sa_worker, seeds))
+
+    # Yol bulamayan zincirlerin skoru inf; min yine doğru sonucu verir
+    return min(results, key=lambda r: r[1])
@@ -0,0 +1,112 @@
+# Karınca yürüyüşü (ant_walk) için Numba çekirdekleri.
+# numba kurulu değilse NUMBA_AVAILABLE = False olur ve aco_core.py
+# saf Python yürüyüşüne (aco_core.ant_walk, NetworkX üzerinden) geri döner.
+# Graph CSR dizileri olarak verilir (aco_core.AntGraph):
+# u'nun komşuları -> indices[indptr[u]:indptr[u+1]], her komşuluk girdisi (slot) için
+# cap[i]: kenar kapasitesi, eta_pow[i]: sezgisel değerin kuvveti η^beta (AntGraph'ta beta başına 1 kez
+# hesaplanır), eid[i]: kenar id'si; tau[eid[i]] = min(feromon, 1000)^alpha (AntGraph'ta feromon
+# değiştikçe, yani tur başına 1 kez hesaplanır).
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
+
+@njit(cache=True, nogil=True)
+def seed(value):
+    # Numba'nın np.random durumu Python'un random modülünden ayrı; koloni başında tohumlanır.
+    np.random.seed(value)
+
+
+@njit(cache=True, nogil=True)
+def ant_walk(indptr, indices, cap, eid, tau, eta_pow, start, end, demand_bw,
+             visited, path, weights, slots):
+    # Tek karınca: aco_core.ant_walk ile aynı kurallar (ziyaret edilmemiş ve kapasitesi
+    # demand_bw'yi karşılayan komşular; ağırlık = min(τ, 1000)^alpha * η^beta, en az 1e-6).
+    # τ^alpha ve η^beta hazır gelir: iç döngüde pow çağrısı yok, ağırlık tek çarpım.
+    # Seçim random.choices yerine kümülatif ağırlık + tek düzgün sayı + searchsorted (ters CDF).
+    # Yol path[:L] içine yazılır, L döner; karınca tıkanırsa 0 döner.
+    # visited girişte temiz kabul edilir, çıkışta sadece yoldaki düğümler sıfırlanır.
+    # weights / slots: en büyük derece kadar yer (çağrılar arasında tekrar kullanılır);
+    # uygun komşuların kümülatif ağırlıkları ve CSR slot'ları.
+    path[0] = start
+    visited[start] = 1
+    L = 1
+    reached = True
+    current = start
+    while current != end:
+        lo = indptr[current]
+        hi = indptr[current + 1]
+        total = 0.0
+        k = 0
+        for i in range(lo, hi):
+            n = indices[i]
+            if visited[n] or cap[i] < demand_bw:
+                continue
+            w = np.float64(tau[eid[i]]) * eta_pow[i]
+            total += max(w, 1e-6)
+            weights[k] = total
+            slots[k] = i
+            k += 1
+        if k == 0:
+            reached = False  # Uygun komşu yok: karınca başarısız
+            break
+
+        # Kümülatif ağırlıklar artan sırada: r'yi aşan ilk eleman ikili aramayla bulunur
+        r = np.random.random() * total
+        j = min(np.searchsorted(weights[:k], r, side='right'), k - 1)
+        current = indices[slots[j]]
+
+        path[L] = current
+        L += 1
+        visited[current] = 1
+
+    for i in range(L):
+        visited[path[i]] = 0
+    return L if reached else 0
+
+
+@njit(cache=True, nogil=True)
+def ant_walks(indptr, indices, cap, eid, tau, eta_pow, start, end, demand_bw,
+              seed_value, paths, lens):
+    # len(lens) karıncayı art arda yürütür: k. karıncanın yolu paths[k, :lens[k]] (başarısızsa lens[k] = 0).
+    # Paralel yürüyüşte iş parçacığı başına bir parça; tamponlar parçaya özeldir ve
+    # Numba'nın rastgele durumu iş parçacığına özel olduğundan parça kendi tohumuyla başlar.
+    np.random.seed(seed_value)
+    n = len(indptr) - 1
+    max_degree = 0
+    for u in range(n):
+        max_degree = max(max_degree, indptr[u + 1] - indptr[u])
+    visited = np.zeros(n, dtype=np.uint8)
+    weights = np.empty(max_degree, dtype=np.float64)
+    slots = np.empty(max_degree, dtype=np.int64)
+    for k in range(len(lens)):
+        lens[k] = ant_walk(indptr, indices, cap, eid, tau, eta_pow, start, end, demand_bw,
+                           visited, paths[k], weights, slots)
+
+
+def warmup():
+    # Çekirdekleri küçük bir graph üzerinde 1 kez çağırarak derler (cache=True ise diskten yüklenir)
+    if not NUMBA_AVAILABLE:
+        return
+    # Dizi tipleri AntGraph ile aynı (float32 / int32) olmalı; aksi halde ayrı bir sürüm derlenir
+    indptr = np.array([0, 1, 3, 4], dtype=np.int32)
+    indices = np.array([1, 0, 2, 1], dtype=np.int32)
+    cap = np.full(4, 100.0, dtype=np.float32)
+    eid = np.array([0, 0, 1, 1], dtype=np.int32)
+    tau = np.full(2, 0.1, dtype=np.float32)
+    eta_pow = np.ones(4, dtype=np.float32)
+    ant_walk(indptr, indices, cap, eid, tau, eta_pow, 0, 2, 10.0,
+             np.zeros(3, dtype=np.uint8), np.empty(3, dtype=np.int32), np.empty(2),
+             np.empty(2, dtype=np.int64))
+    ant_walks(indptr, indices, cap, eid, tau, eta_pow, 0, 2, 10.0, 1,
+              np.empty((2, 3), dtype=np.int32), np.empty(2, dtype=np.int64))
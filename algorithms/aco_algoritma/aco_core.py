@@ -23,9 +23,28 @@ Algoritma üç temel aşamadan oluşur:
 
 Bu çekirdek yapı; QoS yönlendirme, ağ optimizasyonu ve benzeri problemlerde
 genişletilebilir bir temel sunar.
+
+Hızlı yol (AntGraph):
+   - Graf bir kez CSR dizilerine (komşu, kapasite, feromon, η) çevrilir ve karınca
+     yürüyüşü Numba ile derlenmiş çekirdekte (_aco_kernels.ant_walk) çalışır.
+   - numba kurulu değilse AntGraph.walk aynı kurallarla ant_walk'a geri döner.
+
+Paralel koloniler (aco_colonies_parallel):
+   - Farklı (alpha, beta) ayarlı koloniler ayrı süreçlerde çalışır, belirli aralıklarla
+     global en iyi yol tüm kolonilere takviye olarak bırakılır.
 """
 
+import bisect
+import math
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Paket içinden alınır (algorithms.aco_algoritma.aco_core): cache=True derlemeleri modülün
+# paket adıyla saklandığı için çekirdek modülü hep aynı adla içe aktarılmalı.
+from . import _aco_kernels
 
 
 def ant_walk(G, start, end, demand_bw, heuristic_fn,
@@ -57,59 +76,62 @@ def ant_walk(G, start, end, demand_bw, heuristic_fn,
     # Döngüleri önlemek için ziyaret edilen düğümler kümesi
     visited = {current}
 
+    # Adım başına yeni liste kurmak yerine karınca boyunca tekrar kullanılan tamponlar:
+    # nbr_buf[:k] uygun komşular, cum_buf[:k] kümülatif ağırlıkları
+    nbr_buf = []
+    cum_buf = []
+    n_nodes = len(G)
+
     # Karınca hedefe ulaşana kadar devam et
     while current != end:
-        if len(path) > len(G.nodes):
+        if len(path) > n_nodes:
             return None
+        adj = G[current]  # komşu -> kenar verisi (adım başına 1 kez)
+
         # -------------------------------
-        # 1. Bant Genişliği Kısıtı
+        # 1. Bant Genişliği Kısıtı + 2. Olasılık Ağırlıkları
         # -------------------------------
         # Sadece:
         # - Daha önce ziyaret edilmemiş
         # - İstenen bant genişliğini karşılayan
-        # komşular seçilir
-        neighbors = [
-            n for n in G.neighbors(current)
-            if n not in visited and
-            G[current][n].get("capacity_mbps", 0) >= demand_bw
-
-
-        ]
-
-        # Eğer uygun komşu yoksa bu karınca başarısız olur
-        if not neighbors:
-            return None
-
-        weights = []
+        # komşular seçilir (tek geçişte ağırlıklarıyla birlikte)
+        k = 0
+        total = 0.0
+        for n, data in adj.items():
+            if n in visited or data.get("capacity_mbps", 0) < demand_bw:
+                continue
 
-        # -------------------------------
-        # 2. Olasılık Ağırlıklarının Hesaplanması
-        # -------------------------------
-        for n in neighbors:
-            # Feromon değeri (τ)
-            raw_pheromone = G[current][n].get("pheromone", 0.1)
-
-            # Feromon taşmasını (overflow) önlemek için üst sınır
-            tau = min(raw_pheromone, 1000) ** alpha
+            # Feromon değeri (τ); taşmayı (overflow) önlemek için üst sınır
+            tau = min(data.get("pheromone", 0.1), 1000) ** alpha
 
             eta = heuristic_fn(G, current, n) ** beta
 
-
             # Ağırlık = Feromon etkisi * Sezgisel bilgi
-            w = tau * eta
-
             # Sayısal kararlılık için minimum değer sınırı
-            weights.append(max(w, 1e-6))
+            total += max(tau * eta, 1e-6)
+
+            if k < len(nbr_buf):
+                nbr_buf[k] = n
+                cum_buf[k] = total
+            else:
+                nbr_buf.append(n)
+                cum_buf.append(total)
+            k += 1
+
+        # Eğer uygun komşu yoksa bu karınca başarısız olur
+        if k == 0:
+            return None
 
         # -------------------------------
         # 3. Olasılıksal Sonraki Düğüm Seçimi
         # -------------------------------
-        try:
-            # Ağırlıklara göre olasılıksal seçim
-            next_node = random.choices(neighbors, weights=weights, k=1)[0]
-        except ValueError:
+        # random.choices(neighbors, weights) ile aynı seçim (aynı rastgele sayı tüketimi):
+        # kümülatif ağırlıklarda ikili arama
+        if 0.0 < total < math.inf:
+            next_node = nbr_buf[bisect.bisect(cum_buf, random.random() * total, 0, k - 1)]
+        else:
             # Herhangi bir sayısal hata durumunda rastgele seçim
-            next_node = random.choice(neighbors)
+            next_node = random.choice(nbr_buf[:k])
 
         # Seçilen düğüm yola eklenir
         path.append(next_node)
@@ -120,6 +142,242 @@ def ant_walk(G, start, end, demand_bw, heuristic_fn,
     return path
 
 
+class AntGraph:
+    """
+    Bir grafın karınca yürüyüşü için dizi (CSR) görünümü.
+
+    Parametreler:
+    - G            : NetworkX grafiği
+    - heuristic_fn : Sezgisel bilgi fonksiyonu (η); sadece kenara bağlı olduğu için
+                     her kenar yönü için bir kez hesaplanır (adım başına değil)
+    - initial_pheromone : "pheromone" değeri olmayan kenarların başlangıç feromonu
+                     (graf ayrıca dolaşılıp yazılmaz; push_pheromone ile grafa geçer)
+
+    Not:
+    - Kapasiteler ve η kurulum anındaki değerlerdir (graf sonradan değişirse yeniden kurulmalı).
+    - Feromonlar kenar başına self.pher dizisindedir. Kurulumda graftan okunur; buharlaşma
+      (evaporate) ve takviye (deposit) dizide yapılır, graf üzerindeki "pheromone"
+      değerleri sadece push_pheromone() ile (örn. döngü bitince, gösterim için) güncellenir.
+    """
+
+    def __init__(self, G, heuristic_fn, initial_pheromone=0.1):
+        self.G = G
+        self.heuristic_fn = heuristic_fn
+        self.initial_pheromone = initial_pheromone
+        self.nodes = list(G.nodes())
+        self.node2idx = {n: i for i, n in enumerate(self.nodes)}
+
+        # Kenar id'leri: yönsüz grafta (u, v) ve (v, u) aynı feromonu paylaşır
+        self.edges = list(G.edges())
+        self.edge_id = edge_id = {}
+        for i, (u, v) in enumerate(self.edges):
+            edge_id[(u, v)] = i
+            if not G.is_directed():
+                edge_id[(v, u)] = i
+
+        indptr = [0]
+        indices, cap, eid, eta = [], [], [], []
+        for u in self.nodes:
+            for v, data in G[u].items():
+                indices.append(self.node2idx[v])
+                cap.append(data.get("capacity_mbps", 0))
+                eid.append(edge_id[(u, v)])
+                eta.append(heuristic_fn(G, u, v))
+            indptr.append(len(indices))
+        # Kenar başına diziler float32, id'ler int32: sıcak taramalar (yürüyüş, buharlaşma)
+        # yarı bellek bant genişliğiyle çalışır. Kümülatif ağırlıklar çekirdekte float64 toplanır.
+        self.indptr = np.asarray(indptr, dtype=np.int32)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.cap = np.asarray(cap, dtype=np.float32)
+        self.eid = np.asarray(eid, dtype=np.int32)
+        self.eta = np.asarray(eta, dtype=np.float32)
+        self._eta_pow = {}  # beta -> η^beta dizisi (η sabit; karınca adımı başına pow yok)
+        self.pher = np.empty(len(self.edges), dtype=np.float32)
+        # Feromon her değiştiğinde artan sayaç: tau_pow sonucu sürüm değişene kadar geçerli
+        self._pher_version = 0
+        self._tau_key = None
+        self._tau = None
+        self._pher_dirty = False  # dizi graftan ileride mi (saf Python yürüyüşü graftan okur)
+        self.pull_pheromone()
+
+        # Yürüyüş tamponları karıncalar arasında tekrar kullanılır
+        max_degree = int(np.diff(self.indptr).max()) if len(self.nodes) else 0
+        self._visited = np.zeros(len(self.nodes), dtype=np.uint8)
+        self._path = np.empty(len(self.nodes), dtype=np.int32)
+        self._weights = np.empty(max_degree, dtype=np.float64)
+        self._slots = np.empty(max_degree, dtype=np.int64)
+        self._chunk_bufs = {}  # (parça, karınca sayısı) -> walk_many yol tamponları
+
+        # Numba'nın rastgele durumu Python'un random modülünden tohumlanır (random.seed ile tekrar üretilebilir)
+        if _aco_kernels.NUMBA_AVAILABLE:
+            _aco_kernels.seed(random.randrange(2**31))
+
+    def pull_pheromone(self):
+        """
+        Graf üzerindeki "pheromone" değerlerini self.pher dizisine okur; değeri olmayan
+        kenarlar initial_pheromone alır (bu yüzden dizi graftan ileride sayılır).
+        """
+        G = self.G
+        initial = self.initial_pheromone
+        self.pher[:] = [G[u][v].get("pheromone", initial) for u, v in self.edges]
+        self._pher_changed()
+
+    def push_pheromone(self):
+        """self.pher dizisini graf üzerindeki "pheromone" değerlerine yazar."""
+        G = self.G
+        for (u, v), ph in zip(self.edges, self.pher.tolist()):
+            G[u][v]["pheromone"] = ph
+        self._pher_dirty = False
+
+    def evaporate(self, rho):
+        """
+        evaporate_pheromone ile aynı kural, tüm kenarlar için tek vektörel geçişte:
+        τ = max(τ * (1 - rho), 0.01)
+        """
+        np.multiply(self.pher, 1 - rho, out=self.pher)
+        np.maximum(self.pher, 0.01, out=self.pher)
+        self._pher_changed()
+
+    def deposit(self, path, score, Q):
+        """
+        update_pheromone ile aynı kural: yol üzerindeki her kenara Q / max(score, 0.1)
+        eklenir, üst sınır 10000.
+        """
+        if not path or score == 0 or score == float("inf"):
+            return
+        addition = Q / max(score, 0.1)
+        edge_id = self.edge_id
+        # Yol basit (düğüm tekrarı yok) -> kenarlar da tekrarsız, toplu atama güvenli
+        eids = [edge_id[e] for e in zip(path, path[1:])]
+        self.pher[eids] = np.minimum(self.pher[eids] + addition, 10000)
+        self._pher_changed()
+
+    def _pher_changed(self):
+        """self.pher yerinde değiştirildikten sonra çağrılır (graf ve tau_pow önbelleği eskir)."""
+        self._pher_version += 1
+        self._pher_dirty = True
+
+    def tau_pow(self, alpha):
+        """
+        min(τ, 1000)^alpha dizisi (kenar id'si sırasıyla). Feromon bir tur boyunca sabit
+        olduğundan tur başına (alpha başına) 1 kez hesaplanır; karınca adımlarında pow yok.
+        """
+        key = (alpha, self._pher_version)
+        if self._tau_key != key:
+            tau = np.minimum(self.pher, 1000.0)
+            if alpha != 1.0:
+                np.power(tau, alpha, out=tau)
+            self._tau, self._tau_key = tau, key
+        return self._tau
+
+    def eta_pow(self, beta):
+        """η^beta dizisi; beta başına 1 kez hesaplanır ve saklanır."""
+        arr = self._eta_pow.get(beta)
+        if arr is None:
+            arr = self._eta_pow[beta] = self.eta ** beta
+        return arr
+
+    def reinforce(self, iteration_paths, Q, elite_k=None, best=None):
+        """
+        Bir turun takviyesi; iteration_paths: (yol, maliyet) listesi.
+
+        - elite_k None: her başarılı karınca kendi yolunu takviye eder (deposit, klasik AS).
+        - elite_k = k : sadece turun en iyi k yolu takviye edilir, global en iyi yol
+          (best = (yol, maliyet)) da her tur ayrıca takviye edilir (elitist / Max-Min AS).
+          Tur başına feromon yazımı num_ants yerine k + 1 yol olur.
+        """
+        if elite_k is not None:
+            iteration_paths = sorted(iteration_paths, key=lambda pc: pc[1])[:elite_k]
+            if best is not None and best[0]:
+                iteration_paths.append(best)
+        for p, c in iteration_paths:
+            self.deposit(p, c, Q)
+
+    def path_scorer(self, engine, weights):
+        """
+        engine.weighted_score(path, weights, demand_mbps=...) ile aynı skoru veren score(path).
+        Düğüm / kenar payları (engine.additive_costs) 1 kez alınır; yol başına sadece toplama
+        yapılır (metrik döngüleri ve darboğaz hesabı yok). Karıncalar sadece kapasitesi talebi
+        karşılayan kenarlardan geçtiği için yollar her zaman feasible'dır (ceza terimi gerekmez).
+        """
+        costs = engine.additive_costs(weights)
+        node, inner = costs["node"], costs["inner"]
+        engine_edge = engine.edge_index()
+        # Kenar payları AntGraph kenar id'si sırasına dizilir: (u, v) -> edge_id -> pay
+        edge = [costs["edge"][engine_edge[e]] for e in self.edges]
+        edge_id = self.edge_id
+
+        def score(path):
+            return (sum(map(edge.__getitem__, map(edge_id.__getitem__, zip(path, path[1:]))))
+                    + sum(map(node.__getitem__, path))
+                    + sum(map(inner.__getitem__, path[1:-1])))
+        return score
+
+    def walk(self, start, end, demand_bw, alpha=1.0, beta=2.0):
+        """
+        ant_walk ile aynı: tek karıncanın start -> end yolu (düğüm listesi) ya da None.
+        """
+        if not _aco_kernels.NUMBA_AVAILABLE:
+            # Saf Python yürüyüşü feromonu graftan okur: gerekiyorsa önce eşitlenir (tur başına 1 kez)
+            if self._pher_dirty:
+                self.push_pheromone()
+            return ant_walk(self.G, start, end, demand_bw, self.heuristic_fn,
+                            alpha=alpha, beta=beta)
+        L = _aco_kernels.ant_walk(
+            self.indptr, self.indices, self.cap, self.eid, self.tau_pow(float(alpha)),
+            self.eta_pow(float(beta)), self.node2idx[start], self.node2idx[end], float(demand_bw),
+            self._visited, self._path, self._weights, self._slots)
+        if L == 0:
+            return None
+        nodes = self.nodes
+        return [nodes[i] for i in self._path[:L].tolist()]
+
+    def walk_many(self, start, end, demand_bw, num_ants, alpha=1.0, beta=2.0, pool=None, workers=1):
+        """
+        num_ants karıncanın yolları (walk ile aynı; başarısız karınca için None).
+
+        Numba varken karıncalar tek çekirdek çağrısında (ant_walks) önceden ayrılmış bir
+        int32 yol matrisine yürür; tur başına tek tohum random modülünden alınır.
+        pool (ThreadPoolExecutor) ve workers > 1 verilirse karıncalar ceil(num_ants / workers)'lık
+        parçalar halinde iş parçacıklarında yürür: Numba çekirdeği GIL'i bırakır (nogil),
+        CSR ve feromon dizileri kopyalanmadan paylaşılır. Her parça kendi tohumuyla
+        (random modülünden) başlar; sonuç iş parçacığı zamanlamasından bağımsızdır.
+        """
+        if not _aco_kernels.NUMBA_AVAILABLE:
+            return [self.walk(start, end, demand_bw, alpha=alpha, beta=beta) for _ in range(num_ants)]
+
+        args = (self.node2idx[start], self.node2idx[end], float(demand_bw),
+                self.tau_pow(float(alpha)), self.eta_pow(float(beta)))
+        if pool is None or workers <= 1:
+            # Tüm karıncalar tek çekirdek çağrısında (karınca başına çağrı / argüman dönüşümü yok)
+            return self._walk_chunk(0, num_ants, random.randrange(2**31), args)
+
+        chunk = -(-num_ants // workers)
+        sizes = [min(chunk, num_ants - i) for i in range(0, num_ants, chunk)]
+        seeds = [random.randrange(2**31) for _ in sizes]
+        paths = []
+        for chunk_paths in pool.map(self._walk_chunk, range(len(sizes)), sizes, seeds,
+                                    [args] * len(sizes)):
+            paths.extend(chunk_paths)
+        return paths
+
+    def _walk_chunk(self, part, size, seed_value, args):
+        start, end, demand_bw, tau, eta_pow = args
+        # Yol tamponu (size, düğüm sayısı) int32 matris: parça başına 1 kez ayrılır ve turlar
+        # arasında tekrar kullanılır (aynı anda çalışan parçalar farklı tampon kullanır)
+        key = (part, size)
+        bufs = self._chunk_bufs.get(key)
+        if bufs is None:
+            bufs = self._chunk_bufs[key] = (np.empty((size, len(self.nodes)), dtype=np.int32),
+                                            np.empty(size, dtype=np.int64))
+        buf, lens = bufs
+        _aco_kernels.ant_walks(self.indptr, self.indices, self.cap, self.eid, tau, eta_pow,
+                               start, end, demand_bw, seed_value, buf, lens)
+        nodes = self.nodes
+        return [[nodes[i] for i in row[:L].tolist()] if L else None
+                for row, L in zip(buf, lens.tolist())]
+
+
 def update_pheromone(G, path, score, Q):
     """
     Bulunan yolun kalitesine göre feromon miktarını günceller.
@@ -142,13 +400,14 @@ def update_pheromone(G, path, score, Q):
     addition = Q / max(score, 0.1)
 
     # Yol üzerindeki her kenar için feromon ekle
-    for i in range(len(path) - 1):
-        u, v = path[i], path[i + 1]
+    for u, v in zip(path, path[1:]):
+        # Kenar sözlüğü 1 kez alınır (okuma + yazma için ayrı G[u][v] araması yok)
+        data = G[u][v]
 
         # Mevcut feromona ekleme yapılır
         # Maksimum feromon değeri ile sınırlandırılır
-        G[u][v]["pheromone"] = min(
-            G[u][v].get("pheromone", 0.1) + addition,
+        data["pheromone"] = min(
+            data.get("pheromone", 0.1) + addition,
             10000
         )
 
@@ -166,11 +425,112 @@ def evaporate_pheromone(G, rho):
     - Algoritmanın keşif (exploration) yeteneğini korumak
     """
 
-    for u, v in G.edges():
-        current_ph = G[u][v].get("pheromone", 0.1)
+    # Kenar sözlükleri doğrudan dolaşılır (kenar başına iki G[u][v] araması yok)
+    keep = 1 - rho
+    for _, _, data in G.edges(data=True):
+        current_ph = data.get("pheromone", 0.1)
 
         # Buharlaşma sonrası feromon tamamen sıfırlanmaz
-        G[u][v]["pheromone"] = max(
-            current_ph * (1 - rho),
+        data["pheromone"] = max(
+            current_ph * keep,
             0.01
         )
+
+
+# ==================================================
+# PARALEL KOLONİLER (replica exchange)
+# ==================================================
+# Farklı (alpha, beta) keşif ayarlarıyla bağımsız koloniler ayrı süreçlerde çalışır.
+# Feromon paylaşılmaz (çeşitlilik korunur); her swap_interval iterasyonda kolonilerin en iyi
+# yolları toplanır ve global en iyi yol sonraki dönemde her koloniye takviye olarak bırakılır.
+# alpha (τ üssü) x beta (η üssü); koloni k, COLONY_SETTINGS[k % len] ayarını kullanır.
+COLONY_SETTINGS = [(a, b) for a in (1.0, 0.5, 1.5, 2.0) for b in (2.0, 1.0, 3.0)]
+
+# Her süreç graph'ı 1 kez alır (initializer); dönem başına sadece feromon dizisi gönderilir.
+_colony_args = None
+
+
+def _init_colony_worker(G, start, end, demand_bw, score_fn, eta):
+    global _colony_args
+    if eta is None:
+        heuristic_fn = lambda G, u, v: 1.0
+    else:
+        heuristic_fn = lambda G, u, v: eta[(u, v)]
+    # path_costs: süreç başına yol -> maliyet önbelleği (graph, talep ve ağırlıklar sabit)
+    _colony_args = (AntGraph(G, heuristic_fn), start, end, demand_bw, score_fn, {})
+
+
+def _colony_epoch(task):
+    pher, alpha, beta, iterations, num_ants, rho, Q, elite_k, elite, seed_value = task
+    ant_graph, start, end, demand_bw, score_fn, path_costs = _colony_args
+    random.seed(seed_value)
+    if _aco_kernels.NUMBA_AVAILABLE:
+        _aco_kernels.seed(random.randrange(2**31))
+
+    ant_graph.pher[:] = pher
+    ant_graph._pher_changed()
+    if elite is not None:
+        # Global en iyi yol bu kolonide de takviye edilir (feromon kopyalanmaz)
+        ant_graph.deposit(elite[0], elite[1], Q)
+
+    best_path, best_cost = None, float("inf")
+    for _ in range(iterations):
+        iteration_paths = []
+        for path in ant_graph.walk_many(start, end, demand_bw, num_ants, alpha=alpha, beta=beta):
+            if not path:
+                continue
+            key = tuple(path)
+            cost = path_costs.get(key)
+            if cost is None:
+                cost = path_costs[key] = score_fn(path)
+            iteration_paths.append((path, cost))
+            if cost < best_cost:
+                best_path, best_cost = path, cost
+        ant_graph.reinforce(iteration_paths, Q, elite_k, (best_path, best_cost))
+        ant_graph.evaporate(rho)
+    return ant_graph.pher.copy(), best_path, best_cost
+
+
+def aco_colonies_parallel(G, start, end, demand_bw, score_fn, *, colonies=0, settings=None,
+                          num_iterations=20, num_ants=15, rho=0.1, Q=10.0, swap_interval=5,
+                          eta=None, elite_k=None, initial_pheromone=0.1):
+    """
+    colonies adet bağımsız koloniyi ayrı süreçlerde çalıştırır, (en iyi yol, maliyet) döndürür.
+
+    - score_fn(path) -> maliyet: süreçlere gönderildiği için pickle edilebilir olmalı
+      (ör. functools.partial(engine.weighted_score, weights=..., demand_mbps=...)).
+    - settings: koloni başına (alpha, beta) listesi; verilmezse COLONY_SETTINGS sırayla kullanılır.
+    - eta: (u, v) -> sezgisel değer sözlüğü; None ise η = 1.
+    - elite_k: AntGraph.reinforce ile aynı (None: her karınca takviye eder).
+    - colonies <= 0: tüm çekirdekler kullanılır.
+    Başlangıç feromonu graf üzerindeki "pheromone" değerleridir (yoksa initial_pheromone);
+    graf değiştirilmez.
+    Sonuç random.seed ile tekrar üretilebilir (koloni tohumları çağıranın random durumundan).
+    """
+    if colonies <= 0:
+        colonies = os.cpu_count() or 1
+    settings = settings or COLONY_SETTINGS
+    settings = [settings[k % len(settings)] for k in range(colonies)]
+
+    pher = np.asarray([G[u][v].get("pheromone", initial_pheromone) for u, v in G.edges()],
+                      dtype=np.float32)
+    phers = [pher] * colonies
+    best_path, best_cost = None, float("inf")
+    elite = None
+
+    with ProcessPoolExecutor(max_workers=colonies, initializer=_init_colony_worker,
+                             initargs=(G, start, end, demand_bw, score_fn, eta)) as pool:
+        done = 0
+        while done < num_iterations:
+            n = min(swap_interval, num_iterations - done)
+            tasks = [(phers[k], alpha, beta, n, num_ants, rho, Q, elite_k, elite, random.getrandbits(32))
+                     for k, (alpha, beta) in enumerate(settings)]
+            for k, (ph, path, cost) in enumerate(pool.map(_colony_epoch, tasks)):
+                phers[k] = ph
+                if cost < best_cost:
+                    best_path, best_cost = path, cost
+            if best_path is not None:
+                elite = (best_path, best_cost)
+            done += n
+
+    return best_path, best_cost
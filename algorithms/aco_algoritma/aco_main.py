@@ -11,6 +11,7 @@ import os
 import networkx as nx
 import math
 import random
+from concurrent.futures import ThreadPoolExecutor
 
 # --- PROJE DİZİN YAPILANDIRMASI ---
 # Bu bölüm, projenin farklı klasörlerdeki (data, metrics vb.) modüllerine erişebilmesini sağlar.
@@ -25,6 +26,9 @@ if DATA_DIR not in sys.path:
     sys.path.append(DATA_DIR)
 if METRICS_DIR not in sys.path:
     sys.path.append(METRICS_DIR)
+# aco_core paket olarak alınır (Numba çekirdek önbelleği paket adıyla tutulur)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 print("DEBUG DATA_DIR:", DATA_DIR)
 print("DEBUG data/topology içeriği:", os.listdir(DATA_DIR))
 
@@ -32,7 +36,7 @@ print("DEBUG data/topology içeriği:", os.listdir(DATA_DIR))
 # Gerekli özel motorların ve karınca çekirdek fonksiyonlarının içe aktarılması.
 import network_topology
 from metric import MetricsEngine, Weights
-from aco_core import ant_walk, update_pheromone, evaporate_pheromone
+from algorithms.aco_algoritma.aco_core import AntGraph
 
 node_csv_path = os.path.join(DATA_DIR, "NodeData.csv")
 edge_csv_path = os.path.join(DATA_DIR, "EdgeData.csv")
@@ -42,7 +46,9 @@ def run_aco_main(
     num_ants=15,           # Her bir turda ağa salınan yapay karınca sayısı.
     initial_pheromone=0.1, # Başlangıçta tüm yolların (edge) sahip olduğu feromon miktarı.
     rho=0.1,               # Buharlaşma katsayısı; feromonların her turda ne kadarının silineceği.
-    Q=10.0                 # Feromon yoğunluk sabiti; başarılı karıncanın bırakacağı iz gücü.
+    Q=10.0,                # Feromon yoğunluk sabiti; başarılı karıncanın bırakacağı iz gücü.
+    num_workers=1,         # Bir turun karıncalarını paralel yürüten iş parçacığı sayısı (0: tüm çekirdekler).
+    elite_k=None           # Sadece turun en iyi k yolu + global en iyi yol takviye edilir (None: her karınca).
 ):
     """
     Optimizasyon sürecini yürüten ana motor fonksiyonu.
@@ -68,17 +74,13 @@ def run_aco_main(
         
 
 
-    # Teknik uyumluluk için bant genişliği verileri 'capacity' etiketiyle de kopyalanır.
-    for u, v, data in G.edges(data=True):
-        if "bandwidth_mbps" in data:
-            data["capacity_mbps"] = data["bandwidth_mbps"]
-
     # --- 3. ADIM: OPTİMİZASYON KRİTERLERİ VE AĞIRLIKLANDIRMA ---
     metrics_engine = MetricsEngine(G)
     # MetricsEngine: Yolun kalitesini (gecikme, güvenilirlik, maliyet) hesaplayan matematiksel motor.
     # -------------------------------------------------
 # METRICS ENGINE UYUMLULUK YAMASI (ZORUNLU)
 
+    # Düğümler ve kenarlar birer kez dolaşılır; attribute sadece eksikse yazılır.
     for n, data in G.nodes(data=True):
         if 's_ms' in data and 'processing_delay_ms' not in data:
             data['processing_delay_ms'] = data['s_ms']
@@ -90,7 +92,9 @@ def run_aco_main(
             data['link_delay_ms'] = data['delay_ms']
         if 'r_link' in data and 'link_reliability' not in data:
             data['link_reliability'] = data['r_link']
-        if 'bandwidth_mbps' in data and 'capacity_mbps' not in data:
+        # Teknik uyumluluk için bant genişliği verileri 'capacity' etiketiyle de kopyalanır
+        # (ayrı bir kenar döngüsü yerine burada; bandwidth_mbps varsa her zaman ondan alınır).
+        if 'bandwidth_mbps' in data:
             data['capacity_mbps'] = data['bandwidth_mbps']
 
     print("[INFO] Metric uyumluluk eslestirmesi tamamlandi")
@@ -105,56 +109,85 @@ def run_aco_main(
     print("=" * 60)
 
     # --- 4. ADIM: SEZGİSEL (HEURISTIC) KARAR MEKANİZMASI ---
+    # η sadece kenara bağlı ve çalışma boyunca sabit (feromondan etkilenmez): tüm kenarların
+    # [u, v] maliyeti tek toplu çağrıyla (weighted_sum_many = compute + weighted_sum) 1 kez hesaplanır.
+    # [u, v] ve [v, u] aynı maliyete sahip (iki düğüm + tek kenar), kenar başına bir hesap yeterli.
+    edges = list(G.edges())
+    edge_costs = metrics_engine.weighted_sum_many([[u, v] for u, v in edges], weights)
+    edge_eta = {}
+    for (u, v), cost in zip(edges, edge_costs.tolist()):
+        edge_eta[(u, v)] = edge_eta[(v, u)] = 1.0 / max(cost, 1e-6) # Sıfıra bölme hatasını engellemek için küçük bir epsilon.
+
     def heuristic_from_metrics(G, u, v):
         """
         Karıncanın bir sonraki düğüme karar verirken kullandığı 'görüş yeteneği'.
         Sadece feromona değil, o yolun anlık maliyetine (gecikme/güvenilirlik) bakar.
         Maliyet ne kadar düşükse, sonuç (1/cost) o kadar yüksek ve cazip olur.
         """
-        temp_path = [u, v]
-        metrics = metrics_engine.compute(temp_path)
-        cost = metrics_engine.weighted_sum(metrics, weights)
-        return 1.0 / max(cost, 1e-6) # Sıfıra bölme hatasını engellemek için küçük bir epsilon.
+        return edge_eta[(u, v)]
 
     # --- 5. ADIM: ALGORİTMA BAŞLATMA VE FEROMON KURULUMU ---
-    # Başlangıçta tüm yollar karıncalar için eşit cazibededir.
-    for u, v in G.edges():
-        G[u][v]["pheromone"] = initial_pheromone
+    # Başlangıçta tüm yollar karıncalar için eşit cazibededir: graf yeni yüklendi, hiçbir kenarda
+    # feromon yok; AntGraph diziyi kurarken hepsine initial_pheromone verir (ayrı kenar döngüsü yok).
+    # Graf karınca yürüyüşü için 1 kez dizilere çevrilir; sezgisel değer (η) kenar başına
+    # burada 1 kez hesaplanır (karınca adımı başına MetricsEngine çağrısı yok).
+    ant_graph = AntGraph(G, heuristic_from_metrics, initial_pheromone=initial_pheromone)
+    # Yol skoru = düğüm/kenar paylarının toplamı (paylar 1 kez hesaplanır, yol başına metrik döngüsü yok)
+    path_score = ant_graph.path_scorer(metrics_engine, weights)
 
     best_path = None
     min_cost = float("inf") # En iyi (en düşük) maliyeti takip etmek için başlangıç değeri.
+    path_costs = {}         # yol (tuple) -> maliyet; graf, talep ve ağırlıklar çalışma boyunca sabit
 
     print(f"\n[TALEP] {src} -> {dst} | Bant Gen.: {bw} Mbps")
     print("-" * 50)
 
-    # --- 6. ADIM: İTERASYON DÖNGÜSÜ (ÖĞRENME SÜRECİ) ---
-    for i in range(num_iterations):
-        iteration_paths = []
-
-        # Her bir karınca kaynaktan hedefe ulaşmaya çalışır.
-        for _ in range(num_ants):
-            path = ant_walk(G, src, dst, bw, heuristic_from_metrics)
-
-            if path:
-                # Bulunan yolun performans metrikleri (toplam ms, paket kaybı riski vb.) hesaplanır.
-                metrics = metrics_engine.compute(path, demand_mbps=bw)
-                cost = metrics_engine.weighted_sum(metrics, weights)
+    # Aynı turdaki karıncalar birbirinden bağımsız: num_workers > 1 ise iş parçacıklarına bölünür
+    # (derlenmiş yürüyüş GIL'i bırakır, graf dizileri kopyalanmadan paylaşılır).
+    if num_workers <= 0:
+        num_workers = os.cpu_count() or 1
+    pool = ThreadPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
 
-                iteration_paths.append((path, cost))
-
-                # Global en iyi yolu güncelleme kontrolü.
-                if cost < min_cost:
-                    min_cost = cost
-                    best_path = path
-
-        # --- 7. ADIM: FEROMON GÜNCELLEME (HAFIZA VE UNUTMA) ---
-        # 1. Buharlaşma: Kimse tarafından kullanılmayan yolların feromonu azalır (Unutma).
-        evaporate_pheromone(G, rho)
-
-
-        # 2. Takviye: Başarılı yollardan geçen karıncalar o yolu feromonla işaretler (Öğrenme).
-        for p, c in iteration_paths:
-            update_pheromone(G, p, c, Q)
+    # --- 6. ADIM: İTERASYON DÖNGÜSÜ (ÖĞRENME SÜRECİ) ---
+    try:
+        for i in range(num_iterations):
+            iteration_paths = []
+
+            # Her bir karınca kaynaktan hedefe ulaşmaya çalışır.
+            for path in ant_graph.walk_many(src, dst, bw, num_ants, pool=pool, workers=num_workers):
+
+                if path:
+                    # Bulunan yolun performans metrikleri (toplam ms, paket kaybı riski vb.) hesaplanır.
+                    # Karıncalar ilerleyen turlarda aynı yollara yakınsar: skor yol başına 1 kez
+                    # hesaplanır (compute + weighted_sum ile aynı skor, önceden hesaplanmış paylardan).
+                    key = tuple(path)
+                    cost = path_costs.get(key)
+                    if cost is None:
+                        cost = path_costs[key] = path_score(path)
+
+                    iteration_paths.append((path, cost))
+
+                    # Global en iyi yolu güncelleme kontrolü.
+                    if cost < min_cost:
+                        min_cost = cost
+                        best_path = path
+
+            # --- 7. ADIM: FEROMON GÜNCELLEME (HAFIZA VE UNUTMA) ---
+            # Feromonlar döngü boyunca ant_graph dizisinde tutulur (kenar başına sözlük erişimi yok).
+            # 1. Buharlaşma: Kimse tarafından kullanılmayan yolların feromonu azalır (Unutma).
+            ant_graph.evaporate(rho)
+
+
+            # 2. Takviye: Başarılı yollardan geçen karıncalar o yolu feromonla işaretler (Öğrenme).
+            # elite_k verilirse sadece en iyi k yol ve global en iyi yol (elitist / Max-Min AS).
+            ant_graph.reinforce(iteration_paths, Q, elite_k, (best_path, min_cost))
+    finally:
+        # Döngüde hata olsa da iş parçacıkları kapatılır
+        if pool is not None:
+            pool.shutdown()
+
+    # Son feromon değerleri gösterim için grafa 1 kez yazılır
+    ant_graph.push_pheromone()
 
     # --- 8. ADIM: FİNAL RAPORLAMA ---
     if best_path:
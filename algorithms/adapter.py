@@ -1,25 +1,49 @@
 """
 Adapter layer to expose available algorithms in a consistent contract for the UI.
 Each algorithm wrapper returns a dictionary matching the contract described in
-`algorithms/standart.py` (keys: path, metrics, per_node, per_edge, notes)
+`algorithms/standart.py` (keys: path, metrics, per_node, per_edge, notes).
+per_edge is columnar: {"u": [...], "v": [...], "delay_ms": [...], "bandwidth_mbps": [...],
+"reliability": [...]} with one entry per hop; per_edge_rows() gives the list-of-dicts form.
 """
 from typing import Dict, Any, List, Optional
 import networkx as nx
 import time
-import statistics
+import functools
+import random
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+try:
+    from itertools import pairwise
+except ImportError:  # Python < 3.10: itertools recipe
+    from itertools import tee
+
+    def pairwise(iterable):
+        a, b = tee(iterable)
+        next(b, None)
+        return zip(a, b)
 
 # Standard
 # If a standalone 'standart' module is not available, use the project's
 # topology module directly to provide Dijkstra/weighted-path functionality.
-from topology import compute_path_weighted, build_hops_for_path
+from topology import RoutingResult, compute_path_weighted, build_hops_for_path
+
+# Imported once here instead of inside every wrapper call; the wrappers fall back to
+# their non-MetricsEngine paths when it is unavailable (None).
+try:
+    from metrics.metric import MetricsEngine, Weights, PathMetrics
+except Exception:
+    MetricsEngine = Weights = PathMetrics = None
 
 # Genetic
 import importlib.util
 import os
 
+# The loaders below exec modules from file; the result is cached so repeat runs reuse
+# the loaded modules instead of re-reading and re-executing them on every call.
+@functools.lru_cache(maxsize=None)
 def _import_genetic():
     base = os.path.join(os.path.dirname(__file__), "GenetikAlgoritma")
-    ga_path = os.path.join(base, "genetic_algorithm.py")
     metrics_path = os.path.join(base, "test_metrics.py")
 
     # Load mock_data first so genetic_algorithm's top-level import succeeds
@@ -50,14 +74,11 @@ def _import_genetic():
         import types
         m_mod = types.SimpleNamespace()
         def get_path_details(path, G):
-            try:
-                from metrics.metric import MetricsEngine
-            except Exception:
+            if MetricsEngine is None:
                 # best-effort: compute using topology if metrics not available
-                from topology import compute_path_weighted
                 res = compute_path_weighted(G, path[0], path[-1], 1.0, 1.0, 1.0)
                 return { 'total_delay': res.metrics.get('total_delay_ms', 0.0), 'total_reliability': res.metrics.get('total_reliability', 0.0), 'resource_cost': res.metrics.get('resource_cost', 0.0) }
-            engine = MetricsEngine(G)
+            engine = _get_engine(G)
             pm = engine.compute(path)
             return {'total_delay': pm.total_delay_ms, 'total_reliability': pm.total_reliability, 'resource_cost': pm.resource_cost}
         m_mod.get_path_details = get_path_details
@@ -65,9 +86,9 @@ def _import_genetic():
     # Now load genetic module (it may import mock_data/test_metrics at top-level)
     ga_mod = None
     try:
-        spec_ga = importlib.util.spec_from_file_location("genetic_algorithm", ga_path)
-        ga_mod = importlib.util.module_from_spec(spec_ga)
-        spec_ga.loader.exec_module(ga_mod)
+        # Imported by its package name (not from file) so process-pool workers,
+        # including spawn-started ones, can re-import it and unpickle GA functions.
+        ga_mod = importlib.import_module("algorithms.GenetikAlgoritma.genetic_algorithm")
     except Exception as e:
         # If loading fails because of optional dependencies (e.g., openpyxl), provide
         # a lightweight fallback implementation so the UI option still works.
@@ -76,8 +97,7 @@ def _import_genetic():
         def run_genetic_algorithm(G, src, dst, config):
             # Fallback: use deterministic weighted shortest-path from topology
             w_delay, w_rel, w_res = config.get('weights', (0.33, 0.33, 0.34))
-            from topology import compute_path_weighted
-            res = compute_path_weighted(G, src, dst, w_delay, w_rel, w_res, normalize=True)
+            res = _fallback_route(G, src, dst, w_delay, w_rel, w_res)
             return (res.path, res.metrics.get('total_cost', 0.0) if res and res.metrics else 0.0)
         ga_mod.run_genetic_algorithm = run_genetic_algorithm
 
@@ -89,6 +109,9 @@ import importlib.util
 import os
 
 
+# Cached as well: re-executing q_learning would also drop its per-graph caches
+# (agent_shell) and replace the module registered for process-pool workers.
+@functools.lru_cache(maxsize=None)
 def _import_q_learning():
     base = os.path.join(os.path.dirname(__file__), "Q-Q-Learning")
     q_path = os.path.join(base, "q_learning.py")
@@ -104,9 +127,18 @@ def _import_q_learning():
     except Exception:
         pass
 
+    # Its folder is appended to sys.path (after the project root so the local
+    # metrics.py cannot shadow the metrics package) for the sibling _ql_kernels
+    # import, and the module is registered under its name so process-pool
+    # workers can re-import it and unpickle train_parallel's worker.
+    import sys
+    if base not in sys.path:
+        sys.path.append(base)
+
     spec_q = importlib.util.spec_from_file_location("q_learning", q_path)
     q_mod = importlib.util.module_from_spec(spec_q)
     spec_q.loader.exec_module(q_mod)
+    sys.modules["q_learning"] = q_mod
 
     spec_m = importlib.util.spec_from_file_location("q_metrics", metrics_path)
     m_mod = importlib.util.module_from_spec(spec_m)
@@ -117,20 +149,107 @@ def _import_q_learning():
 # Note: Some import path adjustments might be necessary depending on package names
 
 
+_NO_ATTRS: Dict[str, Any] = {}  # shared read-only stand-in for a missing edge
+
+# (graph, graph version, engine) of the last graph an engine was built for. A single slot:
+# the UI runs algorithms on one graph at a time, and only the last graph is kept alive.
+_engine_slot: Optional[tuple] = None
+
+
+def _get_engine(G):
+    """
+    MetricsEngine for G, reused across wrapper calls on the same graph object so its attribute
+    arrays (built on first batch use, e.g. the ACO path scorer) are not rebuilt every run.
+    The arrays are a snapshot, so the cache is keyed on graph identity plus G.graph['version']:
+    code that changes metric attributes in place must bump that version (GA's
+    _map_attrs_inplace does when it adds attribute aliases) to get a fresh engine.
+    """
+    global _engine_slot
+    version = G.graph.get('version', 0)
+    slot = _engine_slot
+    if slot is not None and slot[0] is G and slot[1] == version:
+        return slot[2]
+    engine = MetricsEngine(G)
+    _engine_slot = (G, version, engine)
+    return engine
+
+
+# Deterministic fallback routes (compute_path_weighted) of the last graph: (graph, version, {key: result})
+_fallback_slot: Optional[tuple] = None
+
+
+def _fallback_route(G, src, dst, w_delay, w_rel, w_res):
+    """
+    compute_path_weighted(..., normalize=True) memoized per (src, dst, weights) for the current
+    graph, so repeated fallback runs (compare() runs each algorithm num_runs times) reuse the
+    Dijkstra result. Callers get their own path list and metrics dict (the UI adds 'hops' to it).
+    """
+    global _fallback_slot
+    version = G.graph.get('version', 0)
+    slot = _fallback_slot
+    if slot is None or slot[0] is not G or slot[1] != version:
+        slot = _fallback_slot = (G, version, {})
+    key = (src, dst, w_delay, w_rel, w_res)
+    res = slot[2].get(key)
+    if res is None:
+        res = slot[2][key] = compute_path_weighted(G, src, dst, w_delay, w_rel, w_res, normalize=True)
+    return RoutingResult(path=list(res.path), metrics=dict(res.metrics), note=res.note, hops=res.hops)
+
+
+def _build_per_edge(G, path) -> Dict[str, List[Any]]:
+    """
+    per_edge for a path in columnar form: one list per field (u, v, delay_ms, bandwidth_mbps,
+    reliability), index i being the i-th hop, filled in a single pass over the hops.
+    One adjacency lookup per hop (instead of has_edge + G.edges[u, v]) and the attribute
+    fallbacks (link_delay_ms -> link_delay, bandwidth_mbps -> bandwidth) resolved with a
+    membership test rather than nested .get calls. Missing edges give None values.
+    """
+    adj = G.adj
+    us, vs, delays, bws, rels = [], [], [], [], []
+    for u, v in pairwise(path):
+        nbrs = adj.get(u)
+        ed = nbrs.get(v, _NO_ATTRS) if nbrs is not None else _NO_ATTRS
+        us.append(u)
+        vs.append(v)
+        delays.append(ed["link_delay_ms"] if "link_delay_ms" in ed else ed.get("link_delay"))
+        bws.append(ed["bandwidth_mbps"] if "bandwidth_mbps" in ed else ed.get("bandwidth"))
+        rels.append(ed.get("link_reliability"))
+    return {"u": us, "v": vs, "delay_ms": delays, "bandwidth_mbps": bws, "reliability": rels}
+
+
+def per_edge_rows(per_edge: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Row form ({u, v, delay_ms, ...} per hop) of a columnar per_edge, for callers that want one dict per edge."""
+    keys = list(per_edge)
+    return [dict(zip(keys, row)) for row in zip(*per_edge.values())]
+
+
 def _wrap_genetic(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
     config = {
         'pop_size': int(params.get('pop_size', 50)),
         'generations': int(params.get('generations', 100)),
         'mutation_rate': float(params.get('mutation_rate', 0.1)),
+        'workers': int(params.get('workers', 1)),
+        'suffix_cache': int(params.get('suffix_cache', 0)),
+        'tournament_k': int(params.get('tournament_k', 0)),
+        # Erken durma: en iyi maliyet `patience` nesil boyunca `tol`'dan fazla iyileşmezse (0: kapalı)
+        'patience': int(params.get('patience', 30)),
+        'tol': float(params.get('tol', 1e-4)),
         'weights': (w_delay, w_rel, w_res)
     }
     ga_mod, ga_metrics_mod = _import_genetic()
     run_genetic_algorithm = ga_mod.run_genetic_algorithm
     get_path_details = ga_metrics_mod.get_path_details
 
-    best_path, best_cost = run_genetic_algorithm(G, src, dst, config)
+    # Eşleştirme + MetricsEngine 1 kez kurulur; GA ve aşağıdaki rapor aynı engine'i kullanır
+    prepare_graph = getattr(ga_mod, 'prepare_graph', None)
+    ga_engine = prepare_graph(G) if prepare_graph is not None else None
+
+    if ga_engine is not None:
+        best_path, best_cost = run_genetic_algorithm(G, src, dst, config, ga_engine)
+    else:
+        best_path, best_cost = run_genetic_algorithm(G, src, dst, config)
     if not best_path:
-        return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], "notes": "Hiç yol bulunamadı."}
+        return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, "notes": "Hiç yol bulunamadı."}
 
     # Demand mbps parametresini al (varsa) - önce demand_mbps, sonra demand_bw
     demand_mbps = params.get('demand_mbps') or params.get('demand_bw')
@@ -139,14 +258,13 @@ def _wrap_genetic(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
     
     # MetricsEngine ile metrikleri hesapla (demand_mbps ile)
     try:
-        from metrics.metric import MetricsEngine, Weights
-        engine = MetricsEngine(G)
+        engine = ga_engine if ga_engine is not None else _get_engine(G)
         weights_obj = Weights(w_delay, w_rel, w_res)
         pm = engine.compute(best_path, demand_mbps=demand_mbps)
         
         # Demand kısıtı kontrolü: Eğer yol demand'i karşılamıyorsa, yol bulunamadı olarak döndür
         if not pm.feasible_for_demand:
-            return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], 
+            return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, 
                    "notes": f"Yol bulundu ancak demand ({demand_mbps} Mbps) karşılanamıyor. Yolun minimum kapasitesi: {pm.bottleneck_capacity_mbps:.2f} Mbps."}
         
         total_cost = engine.weighted_sum(pm, weights_obj)
@@ -171,16 +289,7 @@ def _wrap_genetic(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
 
     # per_node & per_edge attempt to use graph attributes when available
     per_node = [{"düğüm": n, "resource_cost": None} for n in best_path]
-    per_edge = []
-    for u, v in zip(best_path, best_path[1:]):
-        ed = G.edges[u, v] if G.has_edge(u, v) else {}
-        per_edge.append({
-            "u": u,
-            "v": v,
-            "delay_ms": ed.get('link_delay_ms', ed.get('link_delay', None)),
-            "bandwidth_mbps": ed.get('bandwidth_mbps', ed.get('bandwidth', None)),
-            "reliability": ed.get('link_reliability', None),
-        })
+    per_edge = _build_per_edge(G, best_path)
 
     return {"path": best_path, "metrics": metrics, "per_node": per_node, "per_edge": per_edge, "notes": "OK"}
 
@@ -195,26 +304,34 @@ def _wrap_qlearning(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
     if demand_mbps is None:
         demand_mbps = 50.0  # Varsayılan değer
 
+    workers = int(params.get('workers', 1))
+    # Öncelikli tekrar (prioritized replay) episod başına ek güncelleme sayısı; 0 = kapalı
+    replay_k = int(params.get('replay_k', 0))
+
     q_mod, m_mod = _import_q_learning()
     QLearningAgent = q_mod.QLearningAgent
 
-    agent = QLearningAgent(G, src, dst, episodes=episodes, alpha=alpha, gamma=gamma, w_delay=w_delay, w_rel=w_rel, w_res=w_res)
-    agent.train()
+    train_parallel = getattr(q_mod, 'train_parallel', None)
+    if train_parallel is not None and workers != 1:
+        # Bağımsız ajanlar süreçlerde eğitilir, Q tabloları birleştirilir
+        agent = train_parallel(G, src, dst, workers=workers, episodes=episodes, alpha=alpha, gamma=gamma, w_delay=w_delay, w_rel=w_rel, w_res=w_res, replay_k=replay_k)
+    else:
+        agent = QLearningAgent(G, src, dst, episodes=episodes, alpha=alpha, gamma=gamma, w_delay=w_delay, w_rel=w_rel, w_res=w_res, replay_k=replay_k)
+        agent.train()
     best_path = agent.get_best_path()
     qmetrics = m_mod
     if not best_path:
-        return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], "notes": "Hiç yol bulunamadı (Q-Learning)."}
+        return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, "notes": "Hiç yol bulunamadı (Q-Learning)."}
 
     # MetricsEngine ile metrikleri hesapla (demand_mbps ile)
     try:
-        from metrics.metric import MetricsEngine, Weights
-        engine = MetricsEngine(G)
+        engine = _get_engine(G)
         weights_obj = Weights(w_delay, w_rel, w_res)
         pm = engine.compute(best_path, demand_mbps=demand_mbps)
         
         # Demand kısıtı kontrolü: Eğer yol demand'i karşılamıyorsa, yol bulunamadı olarak döndür
         if not pm.feasible_for_demand:
-            return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], 
+            return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, 
                    "notes": f"Yol bulundu ancak demand ({demand_mbps} Mbps) karşılanamıyor. Yolun minimum kapasitesi: {pm.bottleneck_capacity_mbps:.2f} Mbps."}
         
         total_cost = engine.weighted_sum(pm, weights_obj)
@@ -227,11 +344,10 @@ def _wrap_qlearning(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
             "weights": {"w_delay": w_delay, "w_rel": w_rel, "w_res": w_res}
         }
     except Exception:
-        # Fallback to original q_metrics method
-        total_delay = qmetrics.calculate_total_delay(G, best_path)
-        rel_cost = qmetrics.calculate_reliability_cost(G, best_path)
-        resource_cost = qmetrics.calculate_resource_cost(G, best_path)
-        total_cost = qmetrics.calculate_weighted_cost(G, best_path, w_delay, w_rel, w_res)
+        # Fallback to original q_metrics method: the three metrics come from one pass over
+        # the path, the weighted cost (calculate_weighted_cost's formula) from the same sums
+        total_delay, rel_cost, resource_cost = qmetrics.calculate_path_metrics(G, best_path)
+        total_cost = (w_delay * total_delay) + (w_rel * rel_cost) + (w_res * resource_cost)
 
         metrics = {
             "total_delay_ms": total_delay,
@@ -242,10 +358,7 @@ def _wrap_qlearning(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
         }
 
     per_node = [{"düğüm": n} for n in best_path]
-    per_edge = []
-    for u, v in zip(best_path, best_path[1:]):
-        ed = G.edges[u, v] if G.has_edge(u, v) else {}
-        per_edge.append({"u": u, "v": v, "delay_ms": ed.get('link_delay_ms', ed.get('link_delay', None)), "bandwidth_mbps": ed.get('bandwidth_mbps', ed.get('bandwidth', None)), "reliability": ed.get('link_reliability', None)})
+    per_edge = _build_per_edge(G, best_path)
 
     return {"path": best_path, "metrics": metrics, "per_node": per_node, "per_edge": per_edge, "notes": "OK"}
 
@@ -260,75 +373,102 @@ def _wrap_aco(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
     Q = float(params.get('Q', 10.0))
 
     try:
-        from algorithms.aco_algoritma.aco_core import ant_walk, update_pheromone, evaporate_pheromone
+        from algorithms.aco_algoritma.aco_core import AntGraph, aco_colonies_parallel
     except Exception:
         # If module not available, fallback to topology shortest path
-        res = compute_path_weighted(G, src, dst, w_delay, w_rel, w_res, normalize=True)
+        res = _fallback_route(G, src, dst, w_delay, w_rel, w_res)
         if not res.path:
-            return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], "notes": res.note or "Yol bulunamadı (ACO fallback)."}
+            return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, "notes": res.note or "Yol bulunamadı (ACO fallback)."}
         m = res.metrics
         per_node = [{"düğüm": n} for n in res.path]
-        per_edge = []
-        for u, v in zip(res.path, res.path[1:]):
-            ed = G.edges[u, v] if G.has_edge(u, v) else {}
-            per_edge.append({"u": u, "v": v, "delay_ms": ed.get('link_delay_ms', ed.get('link_delay', None)), "bandwidth_mbps": ed.get('bandwidth_mbps', ed.get('bandwidth', None)), "reliability": ed.get('link_reliability', None)})
+        per_edge = _build_per_edge(G, res.path)
         return {"path": res.path, "metrics": m, "per_node": per_node, "per_edge": per_edge, "notes": "OK (fallback)"}
 
-    # Ensure pheromone initialized
-    for u, v in G.edges():
-        if 'pheromone' not in G[u][v]:
-            G[u][v]['pheromone'] = float(params.get('initial_pheromone', 0.1))
-
-    try:
-        from metrics.metric import MetricsEngine, Weights
-    except Exception:
-        MetricsEngine = None
-        Weights = None
+    # Edges without pheromone start at initial_pheromone; AntGraph / the colonies fill it in
+    # while reading the pheromone array, so there is no separate edge scan per run
+    initial_pheromone = float(params.get('initial_pheromone', 0.1))
 
     weights_obj = None
+    engine = None
     if Weights is not None:
         weights_obj = Weights(w_delay, w_rel, w_res)
+        engine = _get_engine(G)
 
     best_path = None
     best_cost = float('inf')
-
-    # Iterations
-    for _ in range(num_iterations):
-        iteration_paths = []
-        for _ in range(num_ants):
-            path = ant_walk(G, src, dst, demand_bw, lambda G,u,v: 1.0, alpha=float(params.get('alpha',1.0)), beta=float(params.get('beta',2.0)))
-            if not path:
-                continue
-            # Compute cost using MetricsEngine if available
-            if MetricsEngine is not None and weights_obj is not None:
-                engine = MetricsEngine(G)
-                pm = engine.compute(path, demand_mbps=demand_bw)
-                cost = engine.weighted_sum(pm, weights_obj)
-            else:
-                # simple fallback: use path length
-                cost = len(path)
-
-            iteration_paths.append((path, cost))
-            if cost < best_cost:
-                best_cost = cost
-                best_path = path
-
-        # Pheromone updates
-        for p, c in iteration_paths:
-            update_pheromone(G, p, c, Q)
-        evaporate_pheromone(G, rho)
+    # Ants converge onto the same paths: each distinct path is scored once per run
+    path_costs = {}
+    alpha = float(params.get('alpha', 1.0))
+    beta = float(params.get('beta', 2.0))
+    # elite_k: reinforce only the k best paths of each iteration plus the global best
+    # (elitist / Max-Min AS); None keeps the classic every-ant update
+    elite_k = params.get('elite_k')
+    elite_k = int(elite_k) if elite_k is not None else None
+    # colonies != 1: independent colonies with different (alpha, beta) settings run in
+    # processes and share their best path every swap_interval iterations (0: all cores)
+    colonies = int(params.get('colonies', 1))
+    if colonies != 1 and engine is not None:
+        score_fn = functools.partial(engine.weighted_score, weights=weights_obj, demand_mbps=demand_bw)
+        best_path, best_cost = aco_colonies_parallel(
+            G, src, dst, demand_bw, score_fn, colonies=colonies,
+            num_iterations=num_iterations, num_ants=num_ants, rho=rho, Q=Q,
+            swap_interval=int(params.get('swap_interval', 5)), elite_k=elite_k,
+            initial_pheromone=initial_pheromone)
+    else:
+        # CSR view + compiled ant walk (falls back to ant_walk on G without numba)
+        ant_graph = AntGraph(G, lambda G, u, v: 1.0, initial_pheromone=initial_pheromone)
+        # Ants only cross edges that meet the demand, so the score is a plain sum of
+        # precomputed node / edge terms (same value as weighted_score)
+        path_score = ant_graph.path_scorer(engine, weights_obj) if engine is not None else None
+
+        # Ants of an iteration are independent: with workers > 1 they walk in threads
+        # (the compiled walk releases the GIL and shares the CSR / pheromone arrays)
+        workers = int(params.get('workers', 1))
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            # Iterations
+            for _ in range(num_iterations):
+                iteration_paths = []
+                for path in ant_graph.walk_many(src, dst, demand_bw, num_ants, alpha=alpha, beta=beta,
+                                                pool=pool, workers=workers):
+                    if not path:
+                        continue
+                    # Compute cost using MetricsEngine if available
+                    if engine is not None:
+                        key = tuple(path)
+                        cost = path_costs.get(key)
+                        if cost is None:
+                            cost = path_costs[key] = path_score(path)
+                    else:
+                        # simple fallback: use path length
+                        cost = len(path)
+
+                    iteration_paths.append((path, cost))
+                    if cost < best_cost:
+                        best_cost = cost
+                        best_path = path
+
+                # Pheromone updates
+                # Pheromone stays in the AntGraph array during the run (vectorized evaporation)
+                ant_graph.reinforce(iteration_paths, Q, elite_k, (best_path, best_cost))
+                ant_graph.evaporate(rho)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        ant_graph.push_pheromone()  # keep G's pheromone in sync for later runs / display
 
     if not best_path:
-        return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], "notes": "Hiç yol bulunamadı (ACO)."}
+        return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, "notes": "Hiç yol bulunamadı (ACO)."}
 
     # Build metrics using available engines
-    if MetricsEngine is not None and weights_obj is not None:
-        engine = MetricsEngine(G)
+    if engine is not None:
         pm = engine.compute(best_path, demand_mbps=demand_bw)
         
         # Demand kısıtı kontrolü: Eğer yol demand'i karşılamıyorsa, yol bulunamadı olarak döndür
         if not pm.feasible_for_demand:
-            return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], 
+            return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, 
                    "notes": f"Yol bulundu ancak demand ({demand_bw} Mbps) karşılanamıyor. Yolun minimum kapasitesi: {pm.bottleneck_capacity_mbps:.2f} Mbps."}
         
         total_cost = engine.weighted_sum(pm, weights_obj)
@@ -337,10 +477,7 @@ def _wrap_aco(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
         metrics = {"total_delay_ms": 0.0, "total_reliability": 0.0, "resource_cost": 0.0, "total_cost": best_cost, "weights": {"w_delay": w_delay, "w_rel": w_rel, "w_res": w_res}}
 
     per_node = [{"düğüm": n} for n in best_path]
-    per_edge = []
-    for u, v in zip(best_path, best_path[1:]):
-        ed = G.edges[u, v] if G.has_edge(u, v) else {}
-        per_edge.append({"u": u, "v": v, "delay_ms": ed.get('link_delay_ms', ed.get('link_delay', None)), "bandwidth_mbps": ed.get('bandwidth_mbps', ed.get('bandwidth', None)), "reliability": ed.get('link_reliability', None)})
+    per_edge = _build_per_edge(G, best_path)
 
     return {"path": best_path, "metrics": metrics, "per_node": per_node, "per_edge": per_edge, "notes": "OK"}
 
@@ -353,28 +490,26 @@ def _wrap_sa(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
     else:
         demand_bw = 50.0  # Varsayılan değer (None ise)
     max_iter = int(params.get('max_iter', 5000))
+    workers = int(params.get('workers', 1))
+    # Erken bitiş: best bu kadar iterasyon iyileşmezse SA durur (None: kapalı)
+    patience = params.get('patience', 400)
+    patience = int(patience) if patience is not None else None
 
-    # Try loading SA implementation robustly via file import
+    # Try loading SA implementation robustly. Imported by its package name (not
+    # from file) so process-pool workers can re-import it for parallel chains.
     try:
-        base = os.path.join(os.path.dirname(__file__), "SA_algoritma")
-        sa_path = os.path.join(base, "SA.py")
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("sa_module", sa_path)
-        sa_mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(sa_mod)
+        sa_mod = importlib.import_module("algorithms.SA_algoritma.SA")
         simulated_annealing = sa_mod.simulated_annealing
+        simulated_annealing_parallel = getattr(sa_mod, 'simulated_annealing_parallel', None)
         adapt_graph_for_metrics = getattr(sa_mod, 'adapt_graph_for_metrics', None)
     except Exception:
         # Fallback: if SA module can't be loaded (missing non-critical deps), use topology shortest-path
-        res = compute_path_weighted(G, src, dst, w_delay, w_rel, w_res, normalize=True)
+        res = _fallback_route(G, src, dst, w_delay, w_rel, w_res)
         if not res.path:
-            return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], "notes": res.note or "Yol bulunamadı (SA fallback)."}
+            return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, "notes": res.note or "Yol bulunamadı (SA fallback)."}
         m = res.metrics
         per_node = [{"düğüm": n} for n in res.path]
-        per_edge = []
-        for u, v in zip(res.path, res.path[1:]):
-            ed = G.edges[u, v] if G.has_edge(u, v) else {}
-            per_edge.append({"u": u, "v": v, "delay_ms": ed.get('link_delay_ms', ed.get('link_delay', None)), "bandwidth_mbps": ed.get('bandwidth_mbps', ed.get('bandwidth', None)), "reliability": ed.get('link_reliability', None)})
+        per_edge = _build_per_edge(G, res.path)
         return {"path": res.path, "metrics": m, "per_node": per_node, "per_edge": per_edge, "notes": "OK (SA fallback)"}
 
     # adapt graph if helper exists
@@ -384,32 +519,33 @@ def _wrap_sa(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
     except Exception:
         pass
 
-    try:
-        from metrics.metric import Weights
-        weights_obj = Weights(w_delay, w_rel, w_res)
-    except Exception:
-        weights_obj = None
+    weights_obj = Weights(w_delay, w_rel, w_res) if Weights is not None else None
 
-    best_path, best_score, best_m = simulated_annealing(G, src, dst, weights=weights_obj, demand_mbps=demand_bw, max_iter=max_iter)
+    if simulated_annealing_parallel is not None and workers != 1:
+        # Bağımsız SA zincirleri süreçlerde çalışır, en iyi skor seçilir
+        best_path, best_score, best_m = simulated_annealing_parallel(G, src, dst, workers=workers, weights=weights_obj, demand_mbps=demand_bw, max_iter=max_iter, patience=patience)
+    else:
+        # Graph için önbellekteki engine verilir: attribute dizileri her run'da yeniden kurulmaz
+        engine = _get_engine(G) if MetricsEngine is not None else None
+        best_path, best_score, best_m = simulated_annealing(G, src, dst, weights=weights_obj, demand_mbps=demand_bw, max_iter=max_iter, patience=patience, engine=engine)
 
     if not best_path:
-        return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], "notes": "Hiç yol bulunamadı (SA)."}
+        return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, "notes": "Hiç yol bulunamadı (SA)."}
 
     # best_m is a PathMetrics object
     # Demand kısıtı kontrolü: Eğer yol demand'i karşılamıyorsa, yol bulunamadı olarak döndür
     # Her zaman MetricsEngine ile tekrar hesaplayıp kontrol et (güvenli kontrol)
     try:
-        from metrics.metric import MetricsEngine
-        engine = MetricsEngine(G)
+        engine = _get_engine(G)
         pm = engine.compute(best_path, demand_mbps=demand_bw)
         if not pm.feasible_for_demand:
-            return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], 
+            return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, 
                    "notes": f"Yol bulundu ancak demand ({demand_bw} Mbps) karşılanamıyor. Yolun minimum kapasitesi: {pm.bottleneck_capacity_mbps:.2f} Mbps."}
     except Exception as e:
         # Hata durumunda da best_m'den kontrol et (fallback)
         if hasattr(best_m, 'feasible_for_demand') and not best_m.feasible_for_demand:
             bottleneck = getattr(best_m, 'bottleneck_capacity_mbps', 0.0)
-            return {"path": [], "metrics": {}, "per_node": [], "per_edge": [], 
+            return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, 
                    "notes": f"Yol bulundu ancak demand ({demand_bw} Mbps) karşılanamıyor. Yolun minimum kapasitesi: {bottleneck:.2f} Mbps."}
 
     metrics = {
@@ -421,10 +557,7 @@ def _wrap_sa(G, src, dst, w_delay, w_rel, w_res, params: Dict[str, Any]):
     }
 
     per_node = [{"düğüm": n} for n in best_path]
-    per_edge = []
-    for u, v in zip(best_path, best_path[1:]):
-        ed = G.edges[u, v] if G.has_edge(u, v) else {}
-        per_edge.append({"u": u, "v": v, "delay_ms": ed.get('link_delay_ms', ed.get('link_delay', None)), "bandwidth_mbps": ed.get('bandwidth_mbps', ed.get('bandwidth', None)), "reliability": ed.get('link_reliability', None)})
+    per_edge = _build_per_edge(G, best_path)
 
     return {"path": best_path, "metrics": metrics, "per_node": per_node, "per_edge": per_edge, "notes": "OK"}
 
@@ -445,6 +578,7 @@ ALGORITHMS = {
             {"name": "pop_size", "type": "int", "label": "Popülasyon", "default": 50},
             {"name": "generations", "type": "int", "label": "Nesil sayısı", "default": 100},
             {"name": "mutation_rate", "type": "float", "label": "Mutation rate", "default": 0.1},
+            {"name": "patience", "type": "int", "label": "Erken durma (nesil, 0: kapalı)", "default": 30},
         ]
     },
     "Q-Learning": {
@@ -473,16 +607,60 @@ def list_algorithms():
 ALGORITHMS["ACO (Ant Colony)"]["wrapper"] = _wrap_aco
 ALGORITHMS["Simulated Annealing (SA)"]["wrapper"] = _wrap_sa
 
+# name -> wrapper, built once after the assignments above so run() is a single lookup
+_DISPATCH = {name: meta["wrapper"] for name, meta in ALGORITHMS.items()}
+
+# Algorithms whose wrappers write into G: ACO stores its final pheromone on the edges, GA fills
+# in missing attribute aliases (s_ms -> processing_delay_ms, ...). compare() gives these a
+# fresh copy per run; the others only read G and share it (and its per-graph caches).
+MUTATES_GRAPH = frozenset({"ACO (Ant Colony)", "Genetik (GA)"})
+
 
 def get_algorithm_meta(name: str):
     return ALGORITHMS.get(name)
 
 
 def run(name: str, G: nx.Graph, src: int, dst: int, w_delay: float, w_rel: float, w_res: float, params: Dict[str, Any]):
-    meta = get_algorithm_meta(name)
-    if not meta:
-        raise ValueError(f"Bilinmeyen algoritma: {name}")
-    return meta['wrapper'](G, src, dst, w_delay, w_rel, w_res, params)
+    try:
+        wrapper = _DISPATCH[name]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen algoritma: {name}") from None
+    # Degenerate queries are answered before any algorithm is set up (same notes as
+    # topology.compute_path_weighted, which the fallbacks would otherwise reach)
+    if src == dst:
+        return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, "notes": "Kaynak ve hedef aynı olamaz."}
+    if src not in G or dst not in G:
+        return {"path": [], "metrics": {}, "per_node": [], "per_edge": {}, "notes": "Girilen düğüm bulunamadı."}
+    return wrapper(G, src, dst, w_delay, w_rel, w_res, params)
+
+
+def _compare_run(algo_name, G, src, dst, w_delay, w_rel, w_res, params):
+    """
+    compare() için tek çalıştırma: (path, runtime_ms); algoritma hata verirse path None.
+    Grafı değiştiren algoritmalar kendi kopyası üzerinde çalışır (kopyalama süreye dahil değil).
+    """
+    G_run = G.copy() if algo_name in MUTATES_GRAPH else G
+    start_time = time.perf_counter()
+    try:
+        path = run(algo_name, G_run, src, dst, w_delay, w_rel, w_res, params).get('path', [])
+    except Exception:
+        path = None
+    return path, (time.perf_counter() - start_time) * 1000.0
+
+
+_compare_graph = None  # compare() süreç havuzu: her işçide 1 kez alınan graph
+
+
+def _init_compare_worker(G):
+    global _compare_graph
+    _compare_graph = G
+
+
+def _compare_worker(seed, algo_name, src, dst, w_delay, w_rel, w_res, params):
+    # fork ile açılan işçiler ebeveynin rastgele durumunu kopyalar: her çalıştırma kendi tohumuyla başlar
+    random.seed(seed)
+    np.random.seed(seed)
+    return _compare_run(algo_name, _compare_graph, src, dst, w_delay, w_rel, w_res, params)
 
 
 def compare(
@@ -494,7 +672,8 @@ def compare(
     w_res: float,
     num_runs: int = 5,
     default_params: Optional[Dict[str, Dict[str, Any]]] = None,
-    demand_mbps: Optional[float] = None
+    demand_mbps: Optional[float] = None,
+    workers: int = 1
 ) -> Dict[str, Any]:
     """
     Tüm algoritmaları aynı koşullarda karşılaştırır.
@@ -508,6 +687,8 @@ def compare(
         w_res: Resource weight
         num_runs: Her algoritma için çalıştırma sayısı (N ≥ 5)
         default_params: Algoritma adına göre varsayılan parametreler (opsiyonel)
+        workers: > 1 ise (algoritma, run) çiftleri süreç havuzunda çalışır (0: tüm çekirdekler).
+            Çalıştırmalar aynı çekirdekleri paylaştığından runtime_ms değerleri seri çalıştırmaya göre artabilir.
     
     Returns:
         {
@@ -516,10 +697,8 @@ def compare(
             "best_paths_by_algo": Dict[str, List[int]] - Algoritma adına göre en iyi path
         }
     """
-    # MetricsEngine'i import et
-    try:
-        from metrics.metric import MetricsEngine, Weights, PathMetrics
-    except ImportError:
+    # MetricsEngine modül başında import edildi; yoksa karşılaştırma yapılamaz
+    if MetricsEngine is None:
         raise RuntimeError("metrics.metric modülü bulunamadı. Metrik hesaplamaları için gerekli.")
     
     if num_runs < 5:
@@ -545,7 +724,8 @@ def compare(
     w_res_norm = w_res / total_w
     
     weights_obj = Weights(w_delay_norm, w_rel_norm, w_res_norm)
-    engine = MetricsEngine(G)
+    # Aynı engine, G'yi paylaşan (kopyalanmayan) algoritmaların wrapper'larına da _get_engine ile gider
+    engine = _get_engine(G)
     
     runs_table = []
     algo_results = {}  # {algo_name: [(cost, runtime_ms, path, metrics), ...]}
@@ -558,7 +738,8 @@ def compare(
         "Simulated Annealing (SA)"
     ]
     
-    # Her algoritma için N kez çalıştır
+    # Çalıştırılacak (algoritma, run_id) çiftleri
+    jobs = []
     for algo_name in algorithms_to_compare:
         if algo_name not in ALGORITHMS:
             continue
@@ -569,62 +750,60 @@ def compare(
         
         # Algoritma için varsayılan parametreleri al
         params = default_params.get(algo_name, {})
-        
-        algo_runs = []
-        
         for run_id in range(1, num_runs + 1):
-            # Grafiği kopyala (pheromone gibi state'ler için)
-            G_copy = G.copy()
-            
-            # Runtime ölçümü
-            start_time = time.perf_counter()
-            
-            try:
-                # Algoritmayı çalıştır
-                result = run(algo_name, G_copy, src, dst, w_delay_norm, w_rel_norm, w_res_norm, params)
-                
-                end_time = time.perf_counter()
-                runtime_ms = (end_time - start_time) * 1000.0
-                
-                path = result.get('path', [])
-                
-                if not path or len(path) < 2:
-                    # Yol bulunamadı
-                    runs_table.append([
-                        algo_name, run_id, 0.0, 0.0, 0.0, float('inf'),
-                        runtime_ms, []
-                    ])
-                    algo_runs.append((float('inf'), runtime_ms, [], None))
-                    continue
-                
-                # Metrikleri MetricsEngine ile hesapla
-                pm = engine.compute(path, demand_mbps=demand_mbps)
-                total_cost = engine.weighted_sum(pm, weights_obj)
-                
-                # runs_table için veri hazırla
-                runs_table.append([
-                    algo_name,
-                    run_id,
-                    pm.total_delay_ms,
-                    pm.reliability_cost,
-                    pm.resource_cost,
-                    total_cost,
-                    runtime_ms,
-                    path.copy()
-                ])
-                
-                algo_runs.append((total_cost, runtime_ms, path.copy(), pm))
-                
-            except Exception as e:
-                end_time = time.perf_counter()
-                runtime_ms = (end_time - start_time) * 1000.0
+            jobs.append((algo_name, run_id, params))
+    
+    # Her çalıştırma: (path veya hata durumunda None, runtime_ms).
+    # Çalıştırmalar birbirinden bağımsız: workers > 1 ise süreçlere dağıtılır, G her sürece 1 kez gider.
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_compare_worker, initargs=(G,)) as pool:
+            futures = [pool.submit(_compare_worker, random.randrange(2**31), algo_name, src, dst,
+                                   w_delay_norm, w_rel_norm, w_res_norm, params)
+                       for algo_name, _, params in jobs]
+            outcomes = [f.result() for f in futures]
+    else:
+        outcomes = [_compare_run(algo_name, G, src, dst, w_delay_norm, w_rel_norm, w_res_norm, params)
+                    for algo_name, _, params in jobs]
+    
+    # Sonuçlar iş sırasıyla (algoritma, run_id) işlenir: runs_table sırası seri çalıştırmayla aynı
+    for (algo_name, run_id, _), (path, runtime_ms) in zip(jobs, outcomes):
+        algo_runs = algo_results.setdefault(algo_name, [])
+        try:
+            if not path or len(path) < 2:
+                # Yol bulunamadı (veya algoritma hata verdi)
                 runs_table.append([
                     algo_name, run_id, 0.0, 0.0, 0.0, float('inf'),
                     runtime_ms, []
                 ])
                 algo_runs.append((float('inf'), runtime_ms, [], None))
-        
-        algo_results[algo_name] = algo_runs
+                continue
+            
+            # Metrikleri MetricsEngine ile hesapla
+            pm = engine.compute(path, demand_mbps=demand_mbps)
+            total_cost = engine.weighted_sum(pm, weights_obj)
+            
+            # runs_table için veri hazırla
+            runs_table.append([
+                algo_name,
+                run_id,
+                pm.total_delay_ms,
+                pm.reliability_cost,
+                pm.resource_cost,
+                total_cost,
+                runtime_ms,
+                path.copy()
+            ])
+            
+            algo_runs.append((total_cost, runtime_ms, path.copy(), pm))
+            
+        except Exception as e:
+            runs_table.append([
+                algo_name, run_id, 0.0, 0.0, 0.0, float('inf'),
+                runtime_ms, []
+            ])
+            algo_runs.append((float('inf'), runtime_ms, [], None))
     
     # Summary table oluştur
     summary_table = []
@@ -648,16 +827,21 @@ def compare(
             continue
         
         # Ortalama metrikler
-        avg_delay = statistics.mean([m.total_delay_ms for m in metrics_list]) if metrics_list else 0.0
-        avg_reliability_cost = statistics.mean([m.reliability_cost for m in metrics_list]) if metrics_list else 0.0
-        avg_resource_cost = statistics.mean([m.resource_cost for m in metrics_list]) if metrics_list else 0.0
+        # (run başına gecikme, güvenilirlik, kaynak) tek dizide; ortalamalar tek reduction ile
+        if metrics_list:
+            metric_arr = np.array([(m.total_delay_ms, m.reliability_cost, m.resource_cost) for m in metrics_list],
+                                  dtype=np.float64)
+            avg_delay, avg_reliability_cost, avg_resource_cost = metric_arr.mean(axis=0).tolist()
+        else:
+            avg_delay = avg_reliability_cost = avg_resource_cost = 0.0
         
         # Toplam maliyet istatistikleri
-        avg_cost = statistics.mean(costs)
-        std_cost = statistics.stdev(costs) if len(costs) > 1 else 0.0
+        cost_arr = np.asarray(costs, dtype=np.float64)
+        avg_cost = float(cost_arr.mean())
+        std_cost = float(cost_arr.std(ddof=1)) if len(costs) > 1 else 0.0
         best_cost = min(costs)
         worst_cost = max(costs)
-        avg_runtime = statistics.mean(runtimes) if runtimes else 0.0
+        avg_runtime = float(np.mean(runtimes)) if runtimes else 0.0
         
         # Summary table: [algo_name, avg_delay, avg_reliability_cost, avg_resource_cost, avg_total_cost, std_cost, best_cost, worst_cost, avg_runtime]
         summary_table.append([
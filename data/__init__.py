@@ -0,0 +1 @@
+# Topoloji verisi (CSV) ve yükleyicisi. Kullanım: from data import network_topology
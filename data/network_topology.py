@@ -1,4 +1,3 @@
-import pandas as pd
 import networkx as nx
 
 # ===============================
@@ -8,28 +7,38 @@ def load_topology(
     node_csv="NodeData.csv",
     edge_csv="EdgeData.csv"
 ):
+    # pandas sadece CSV okurken gerekir; modülü import eden (ör. GA) her yerde yüklenmesin
+    import pandas as pd
+
     node_df = pd.read_csv(node_csv, sep=";", decimal=",")
     edge_df = pd.read_csv(edge_csv, sep=";", decimal=",")
 
     G = nx.Graph()
 
+    # Sütunlar tek seferde Python listelerine çevrilir; iterrows'un satır başına
+    # Series oluşturması yerine düğüm/kenarlar toplu eklenir (aynı sıra, aynı değerler).
+
     # NODE
-    for _, r in node_df.iterrows():
-        G.add_node(
-            int(r["node_id"]),
-            s_ms=float(r["s_ms"]),
-            r_node=float(r["r_node"])
+    G.add_nodes_from(
+        (node_id, {"s_ms": s_ms, "r_node": r_node})
+        for node_id, s_ms, r_node in zip(
+            node_df["node_id"].astype(int).tolist(),
+            node_df["s_ms"].astype(float).tolist(),
+            node_df["r_node"].astype(float).tolist(),
         )
+    )
 
     # EDGE
-    for _, r in edge_df.iterrows():
-        G.add_edge(
-            int(r["src"]),
-            int(r["dst"]),
-            capacity_mbps=float(r["capacity_mbps"]),
-            delay_ms=float(r["delay_ms"]),
-            r_link=float(r["r_link"])
+    G.add_edges_from(
+        (u, v, {"capacity_mbps": cap, "delay_ms": delay, "r_link": r_link})
+        for u, v, cap, delay, r_link in zip(
+            edge_df["src"].astype(int).tolist(),
+            edge_df["dst"].astype(int).tolist(),
+            edge_df["capacity_mbps"].astype(float).tolist(),
+            edge_df["delay_ms"].astype(float).tolist(),
+            edge_df["r_link"].astype(float).tolist(),
         )
+    )
 
     print(
     f"Graph yüklendi\n"
@@ -21,6 +21,7 @@ from matplotlib.figure import Figure  # Pop-up pencerede Figure objesi kullanmak
 import networkx as nx
 from tkinter import messagebox
 import math
+import argparse
 import numpy as np
 from matplotlib.collections import LineCollection
 from matplotlib.patches import Circle
@@ -60,6 +61,10 @@ except Exception:
 # ------------------------------------------------------------
 ctk.set_appearance_mode("Dark")
 
+# GA / Q-Learning / SA için süreç, ACO için iş parçacığı sayısı (--num-workers ile değişir).
+# 1: seri çalışma (varsayılan), 0: tüm çekirdekler.
+NUM_WORKERS = 1
+
 
 class RoutingApp(ctk.CTk):
     def __init__(self):
@@ -691,6 +696,7 @@ class RoutingApp(ctk.CTk):
         demand_mbps = float(self.demand_mbps_slider.get())
         params['demand_mbps'] = demand_mbps
         params['demand_bw'] = demand_mbps  # bazı algoritmalar demand_bw adıyla bekleyebilir
+        params['workers'] = NUM_WORKERS  # paralel çalıştırılabilen algoritmalar için süreç sayısı
 
         return params
 
@@ -1725,7 +1731,8 @@ class ComparisonWindow(ctk.CTkToplevel):
             for algo_name in ["ACO (Ant Colony)", "Genetik (GA)", "Q-Learning", "Simulated Annealing (SA)"]:
                 default_params[algo_name] = {
                     'demand_mbps': self.demand_mbps,
-                    'demand_bw': self.demand_mbps
+                    'demand_bw': self.demand_mbps,
+                    'workers': NUM_WORKERS
                 }
 
             results = compare_algorithms(
@@ -1996,6 +2003,11 @@ class ComparisonWindow(ctk.CTkToplevel):
 # Program entrypoint
 # ------------------------------------------------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="QoS Multi-Objective Routing Optimization")
+    parser.add_argument("--num-workers", type=int, default=1,
+                        help="GA / Q-Learning / SA için paralel süreç sayısı (0: tüm çekirdekler)")
+    NUM_WORKERS = parser.parse_args().num_workers
+
     # RoutingApp ana pencereyi oluştur ve event loop'u başlat
     app = RoutingApp()
     app.mainloop()
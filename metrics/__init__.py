@@ -0,0 +1,5 @@
+# Metrik hesaplama paketi. Algoritmalar motoru paket üzerinden alabilir:
+#   from metrics import MetricsEngine, Weights
+from .metric import MetricsEngine, PathMetrics, Weights
+
+__all__ = ["MetricsEngine", "PathMetrics", "Weights"]
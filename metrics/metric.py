@@ -6,9 +6,10 @@
 
 import math
 from dataclasses import dataclass
-from typing import Dict, Optional, Sequence
+from typing import Dict, List, Optional, Sequence
 
 import networkx as nx
+import numpy as np
 
 
 
@@ -86,15 +87,20 @@ class MetricsEngine:
         *,
         reference_bandwidth_mbps: float = 1000.0,
         eps: float = 1e-12,
+        table_dtype=np.float64,
     ):
         """
         G: NetworkX graph (node ve edge attribute'larını içerir)
         reference_bandwidth_mbps: Resource cost için referans bant genişliği (1 Gbps)
         eps: log(0) ve bölme hatalarını önlemek için kullanılan küçük sayı
+        table_dtype: Toplu hesaplamada kullanılan attribute tablolarının tipi.
+            float64 -> compute() ile birebir aynı sonuç; float32 -> yarı bellek, ~1e-7 bağıl fark.
         """
         self.G = G
         self.ref_bw = reference_bandwidth_mbps
         self.eps = eps
+        self.table_dtype = table_dtype
+        self._arrays = None  # NumPy (SoA) attribute dizileri, ilk toplu hesapta kurulur
 
     def _edge(self, u: int, v: int) -> Dict:
         """
@@ -203,3 +209,259 @@ class MetricsEngine:
             score += infeasible_penalty
 
         return score
+
+
+
+    # Toplu (Vektörel) Hesaplama------------------------------------------
+
+    # edge_table sütunları
+    EDGE_DELAY, EDGE_LOG_REL, EDGE_CAP = 0, 1, 2
+
+    def _build_arrays(self) -> None:
+        """
+        Node/edge attribute'larını NumPy dizilerine çevirir.
+        Her node'a ve edge'e bir tam sayı id verilir; (u, v) ve (v, u) aynı edge id'ye gider.
+        Edge attribute'ları tek bir (E, 3) tabloda tutulur: [link_delay, -log(link_reliability), capacity];
+        böylece bir edge'in üç değeri bellekte yan yana durur ve tek gather ile okunur.
+        Güvenilirlikler baştan -log(r) olarak saklanır: path güvenilirliği çarpım yerine toplam olur
+        (uzun path'lerde underflow yok, segment toplamlarıyla hesaplanır, her çağrıda log alınmaz).
+        Diziler graph'ın o anki halinin kopyasıdır (attribute'lar sonradan değişirse yansımaz).
+        """
+        node_index: Dict[int, int] = {}
+        proc_delay: List[float] = []
+        node_log_rel: List[float] = []
+        for n, data in self.G.nodes(data=True):
+            node_index[n] = len(node_index)
+            proc_delay.append(float(data["processing_delay_ms"]))
+            node_log_rel.append(-math.log(max(float(data["node_reliability"]), self.eps)))
+
+        edge_index: Dict[tuple, int] = {}
+        edge_table = np.empty((self.G.number_of_edges(), 3), dtype=self.table_dtype)
+        for eid, (u, v, data) in enumerate(self.G.edges(data=True)):
+            # Yönsüz graph: iki yön de aynı satıra gider (min/max ile kanonik anahtar
+            # kurmaktan daha ucuz, arama tek dict erişimi)
+            edge_index[(u, v)] = eid
+            edge_index[(v, u)] = eid
+            edge_table[eid] = (
+                float(data["link_delay_ms"]),
+                -math.log(max(float(data["link_reliability"]), self.eps)),
+                float(data["capacity_mbps"]),
+            )
+
+        self._arrays = {
+            "node_index": node_index,
+            # Düğüm id'leri zaten 0..N-1 sırasındaysa path'ler index çevirisi yapılmadan kullanılır
+            "identity_nodes": all(n == i for n, i in node_index.items()),
+            "edge_index": edge_index,
+            "proc_delay": np.array(proc_delay, dtype=self.table_dtype),
+            "node_log_rel": np.array(node_log_rel, dtype=self.table_dtype),
+            "edge_table": edge_table,
+            # Tek path skorlaması (weighted_score) için aynı tabloların Python listesi hali:
+            # kısa path'lerde eleman başına NumPy erişiminden çok daha ucuz
+            "edge_rows": edge_table.tolist(),
+            "proc_list": proc_delay,
+            "node_rel_list": node_log_rel,
+        }
+
+    def edge_index(self) -> Dict[tuple, int]:
+        """
+        {(u, v): edge id} sözlüğünü döndürür (iki yön de aynı id).
+        Algoritmalar path'lerin edge id'lerini kendileri taşımak isterse bu id'leri kullanır.
+        """
+        if self._arrays is None:
+            self._build_arrays()
+        return self._arrays["edge_index"]
+
+    def path_edge_ids(self, path: Sequence[int]) -> Optional[List[int]]:
+        """
+        Path üzerindeki edge'lerin id listesini döndürür.
+        Path geçersizse (2'den az düğüm veya graph'ta olmayan edge) exception yerine None döner;
+        böylece algoritmalar compute() çağırmadan önce ucuz bir kontrol yapabilir.
+        """
+        if path is None or len(path) < 2:
+            return None
+        if self._arrays is None:
+            self._build_arrays()
+        edge_index = self._arrays["edge_index"]
+        eids = []
+        for u, v in zip(path[:-1], path[1:]):
+            e = edge_index.get((u, v))
+            if e is None:
+                return None
+            eids.append(e)
+        return eids
+
+    def weighted_score(
+        self,
+        path: Sequence[int],
+        weights: Weights,
+        *,
+        demand_mbps: Optional[float] = None,
+        infeasible_penalty: float = 1e9,
+    ) -> float:
+        """
+        Tek bir path için compute() + weighted_sum() skorunu tek geçişte hesaplar.
+        Üç metrik aynı döngüde, hazır tablolardan toplanır (PathMetrics nesnesi,
+        graph sözlük erişimi ve log hesabı yok). Toplama sırası compute() ile aynıdır;
+        float64 tablolarla sonuç birebir aynıdır.
+        Geçersiz path (2'den az düğüm veya graph'ta olmayan edge) için inf döner.
+        """
+        eids = self.path_edge_ids(path)
+        if eids is None:
+            return float("inf")
+        a = self._arrays
+        nids = path if a["identity_nodes"] else [a["node_index"][n] for n in path]
+        proc = a["proc_list"]
+        node_rel = a["node_rel_list"]
+        rows = a["edge_rows"]
+
+        processing_sum = 0.0
+        for n in nids[1:-1]:
+            processing_sum += proc[n]
+        reliability_cost = 0.0
+        for n in nids:
+            reliability_cost += node_rel[n]
+
+        link_delay_sum = 0.0
+        resource_cost = 0.0
+        bottleneck = float("inf")
+        for e in eids:
+            delay, log_rel, cap = rows[e]
+            link_delay_sum += delay
+            reliability_cost += log_rel
+            cap = max(cap, self.eps)
+            bottleneck = min(bottleneck, cap)
+            resource_cost += self.ref_bw / cap
+
+        w = weights.normalized()
+        score = (
+            w.w_delay * (link_delay_sum + processing_sum)
+            + w.w_reliability * reliability_cost
+            + w.w_resource * resource_cost
+        )
+        if demand_mbps is not None and not demand_mbps <= bottleneck:
+            score += infeasible_penalty
+        return score
+
+    def additive_costs(self, weights: Weights) -> Dict[str, Dict]:
+        """
+        Weighted sum skorunu düğüm ve edge başına paylara ayırır (ağırlıklar normalize edilir):
+          node[n]      = w_reliability * -log(node_reliability)
+          inner[n]     = w_delay * processing_delay_ms   (sadece ara düğümler için sayılır)
+          edge[(u, v)] = w_delay * link_delay_ms + w_reliability * -log(link_reliability)
+                         + w_resource * ref_bw / capacity_mbps
+        Demand'i karşılayan bir path için weighted_score = Σ node + Σ inner (ara düğümler) + Σ edge;
+        sadece toplama sırasından gelen yuvarlama farkı olabilir. Bottleneck / demand cezası
+        dahil değildir: path'lerin feasible olduğunu garanti eden algoritmalar için.
+        Dönüş: {"node": {n: pay}, "inner": {n: pay}, "edge": {edge id: pay}} (edge_index() id'leri).
+        """
+        if self._arrays is None:
+            self._build_arrays()
+        a = self._arrays
+        w = weights.normalized()
+        table = a["edge_table"].astype(np.float64)
+        edge = (
+            w.w_delay * table[:, self.EDGE_DELAY]
+            + w.w_reliability * table[:, self.EDGE_LOG_REL]
+            + w.w_resource * self.ref_bw / np.maximum(table[:, self.EDGE_CAP], self.eps)
+        )
+        nodes = list(a["node_index"])
+        return {
+            "node": dict(zip(nodes, (w.w_reliability * np.asarray(a["node_rel_list"])).tolist())),
+            "inner": dict(zip(nodes, (w.w_delay * np.asarray(a["proc_list"])).tolist())),
+            "edge": dict(enumerate(edge.tolist())),
+        }
+
+    def weighted_sum_many(
+        self,
+        paths: Sequence[Sequence[int]],
+        weights: Weights,
+        *,
+        demand_mbps: Optional[float] = None,
+        infeasible_penalty: float = 1e9,
+        cutoff: Optional[float] = None,
+        path_edges: Optional[Sequence[Optional[Sequence[int]]]] = None,
+    ) -> np.ndarray:
+        """
+        Birden fazla path'in weighted sum skorunu tek seferde hesaplar.
+        Sonuç compute() + weighted_sum() ile aynıdır; fakat path başına Python
+        döngüsü yerine tüm path'ler birleştirilip NumPy ile segment bazlı toplanır.
+        Geçersiz path (2'den az düğüm veya graph'ta olmayan edge) için skor inf olur.
+
+        cutoff: Verilirse, sadece gecikme terimi bile cutoff'u aşan path'ler için
+        güvenilirlik/kaynak hesabı yapılmaz ve skor inf döner (dal-sınır). Diğer terimler
+        negatif olamayacağı için (güvenilirlik <= 1) bu path'lerin gerçek skoru da cutoff'tan büyüktür.
+
+        path_edges: paths ile aynı sırada, her path'in edge id listesi (edge_index() id'leri).
+        Bilinen path'ler için (u, v) sözlük aramaları atlanır; None olan elemanlar burada bulunur.
+        """
+        if self._arrays is None:
+            self._build_arrays()
+        a = self._arrays
+        node_index = a["node_index"]
+        identity_nodes = a["identity_nodes"]
+
+        P = len(paths)
+        valid = np.ones(P, dtype=bool)
+        node_ids: List[int] = []
+        node_seg: List[int] = []
+        inner_ids: List[int] = []
+        inner_seg: List[int] = []
+        edge_ids: List[int] = []
+        edge_seg: List[int] = []
+
+        # Path'leri düz index listelerine çevir (hangi elemanın hangi path'e ait olduğu *_seg'de)
+        for p, path in enumerate(paths):
+            eids = path_edges[p] if path_edges is not None else None
+            if eids is None:
+                eids = self.path_edge_ids(path)
+                if eids is None:
+                    valid[p] = False
+                    continue
+            nids = path if identity_nodes else [node_index[n] for n in path]
+            node_ids.extend(nids)
+            node_seg.extend([p] * len(nids))
+            inner_ids.extend(nids[1:-1])
+            inner_seg.extend([p] * (len(nids) - 2))
+            edge_ids.extend(eids)
+            edge_seg.extend([p] * len(eids))
+
+        node_ids = np.asarray(node_ids, dtype=np.intp)
+        node_seg = np.asarray(node_seg, dtype=np.intp)
+        edge_seg = np.asarray(edge_seg, dtype=np.intp)
+
+        # Path'lerdeki tüm edge'lerin [delay, rel, cap] satırları tek seferde okunur
+        edges = a["edge_table"][edge_ids]
+
+        # 1) Toplam gecikme: link gecikmeleri + ara düğüm işlem gecikmeleri
+        delay = np.bincount(edge_seg, weights=edges[:, self.EDGE_DELAY], minlength=P)
+        delay += np.bincount(inner_seg, weights=a["proc_delay"][inner_ids], minlength=P)
+
+        w = weights.normalized()
+
+        # Gecikme terimi cutoff'u aşan path'ler kalan hesaplardan çıkarılır
+        if cutoff is not None:
+            valid &= w.w_delay * delay <= cutoff
+            keep_n = valid[node_seg]
+            keep_e = valid[edge_seg]
+            node_ids, node_seg = node_ids[keep_n], node_seg[keep_n]
+            edges, edge_seg = edges[keep_e], edge_seg[keep_e]
+
+        # 2) Güvenilirlik maliyeti: -log(r) toplamı (düğümler + bağlantılar), log'lar tabloda hazır
+        rel_cost = np.bincount(node_seg, weights=a["node_log_rel"][node_ids], minlength=P)
+        rel_cost += np.bincount(edge_seg, weights=edges[:, self.EDGE_LOG_REL], minlength=P)
+
+        # 3) Kaynak maliyeti ve darboğaz kapasite
+        cap = np.maximum(edges[:, self.EDGE_CAP], self.eps)
+        resource = np.bincount(edge_seg, weights=self.ref_bw / cap, minlength=P)
+
+        scores = w.w_delay * delay + w.w_reliability * rel_cost + w.w_resource * resource
+
+        # 4) Talep kontrolü: darboğaz < demand ise ceza
+        if demand_mbps is not None and len(edge_seg) > 0:
+            bottleneck = np.full(P, np.inf)
+            np.minimum.at(bottleneck, edge_seg, cap)
+            scores[bottleneck < demand_mbps] += infeasible_penalty
+
+        scores[~valid] = np.inf
+        return scores